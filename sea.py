@@ -13,28 +13,58 @@ All X: {0, 1, ..., maxX}
 All Y: {0, 1, ..., maxY}
 """
 
+import time
+
 import numpy
-import pygame
 
-from seacreature import *
-from seaposition import *
+from seacreature import SeaCreature, Shark, Fish
+from seaposition import SeaPosition
+from seaneighbours import NEAR_SHARK, getNeighbourTable
+from seajournal import EMPTY, FISH, SHARK, SeaJournal
+
+# journal state of the thing in a cell
+STATES = {type(None): EMPTY, Fish: FISH, Shark: SHARK}
+
+# what the thing in a cell adds to the near counts of the cells next to it
+NEAR_WEIGHTS = {type(None): 0, Fish: 1, Shark: NEAR_SHARK}
 
 class Sea(object):
     """
     A sea of x by y cells.
     A cell can hold one thing or be empty (None).
+    The cells are held in a flat list, cell (x,y) is cells[x * maxY + y],
+    so that neighbours can be found from a NeighbourTable.
+    Dead creatures are taken out of their cell when they die, and out of
+    the list of creatures at the end of the chronon by cleanCreatures,
+    which closes the gaps from the first of the dead on. That costs the
+    number of living creatures after the first dead one, rather than a
+    swap per death, but keeps the creatures in the order they were born,
+    the turn order of the baseline, so seeded runs and restored runs go
+    the same way.
+    Every change to a cell goes through putCell, which notes it in the
+    change journal when there is one.
     """
     def __init__(self, x, y, random):
         """
         Initialize an empty sea.
         """
         self.creatures = []
+        self.dead = [] # died this chronon, still in self.creatures
         self.maxX = x
         self.maxY = y
-        self.sea = [[ None for Y in range(self.maxY)] for X in range(self.maxX)]
+        self.cells = [None] * (self.maxX * self.maxY)
         self.sharks = 0
         self.fishes = 0
         self.random = random
+        self.journal = None
+        self.metrics = None
+        self.near = [] # (traditional, counts, adjacent), see getNearCounts
+        self.ages = None # {Shark: {epoch: count}, Fish: ...}, see enableAges
+        self.clock = 0 # chronons turned
+        self.turning = None # index of the creature taking its turn
+        self.turnEnd = 0 # creatures at the start of the turn
+        self.stateHash = None # Zobrist hash of the cells, see enableStateHash
+        self.sleepers = {} # traditional: adjacent, of the patterns of dormant creatures
 
     def getMaxX(self):
         return self.maxX
@@ -42,20 +72,127 @@ class Sea(object):
     def getMaxY(self):
         return self.maxY
 
+    def getNeighbourTable(self, traditional):
+        return getNeighbourTable(self.maxX, self.maxY, traditional)
+
+    def enableJournal(self):
+        """
+        Start recording changed cells, return the SeaJournal.
+        """
+        if self.journal is None:
+            self.journal = SeaJournal()
+        return self.journal
+
+    def enableMetrics(self, metrics=None):
+        """
+        Start counting what the creatures do, return the Metrics.
+        """
+        from seametrics import Metrics
+        self.metrics = metrics if metrics is not None else Metrics()
+        return self.metrics
+
+    def pullJournal(self, net=True):
+        """
+        Return the (cells, before, after) arrays of the cells changed since
+        the last pull, see SeaJournal.pull.
+        """
+        return self.journal.pull(net)
+
+    def getNearCounts(self, traditional):
+        """
+        Return the count of the creatures next to each flat cell, in the
+        traditional search pattern, as fishes + NEAR_SHARK * sharks.
+        The counts are made on first use, then kept up to date by putCell.
+        Return None for the traditional pattern, with four neighbours
+        looking at the cells is cheaper than keeping their counts.
+        """
+        if traditional:
+            return None
+        for pattern, counts, adjacent in self.near:
+            if pattern == traditional:
+                return counts
+        adjacent = self.getNeighbourTable(traditional).adjacent
+        weights = [NEAR_WEIGHTS[type(c)] for c in self.cells]
+        counts = [sum([weights[o] for o in cells]) for cells in adjacent]
+        self.near.append((traditional, counts, adjacent))
+        return counts
+
+    def putCell(self, i, c):
+        """
+        Put c, a creature or None, in flat cell i.
+        """
+        if self.journal is not None:
+            self.journal.record(i, STATES[type(self.cells[i])], STATES[type(c)])
+        if self.stateHash is not None:
+            keys = self.hashKeys
+            self.stateHash ^= keys[type(self.cells[i])][i] ^ keys[type(c)][i]
+        if c is None and self.sleepers and self.cells[i] is not None:
+            # a cell next to a dormant creature is free, it looks again
+            cells = self.cells
+            for adjacent in self.sleepers.values():
+                for o in adjacent[i]:
+                    d = cells[o]
+                    if d is not None and d.asleep >= 0:
+                        self.wake(d)
+        if self.near:
+            delta = NEAR_WEIGHTS[type(c)] - NEAR_WEIGHTS[type(self.cells[i])]
+            if delta:
+                # the search patterns are symmetric, the cells next to i
+                # are the cells that have i next to them
+                for pattern, counts, adjacent in self.near:
+                    for o in adjacent[i]:
+                        counts[o] += delta
+        self.cells[i] = c
+
+    def enableStateHash(self):
+        """
+        Keep the state hash of the cells from now on, putCell updates it.
+        """
+        if self.stateHash is None:
+            from seasteady import keyTable, gridHash
+            keys = keyTable(len(self.cells))
+            self.hashKeys = {kind: keys[state] for kind, state in STATES.items()} # by the type in the cell
+            self.stateHash = gridHash(numpy.fromiter((STATES[type(c)] for c in self.cells), dtype=numpy.int8, count=len(self.cells)))
+
+    def getStateHash(self):
+        self.enableStateHash()
+        return self.stateHash
+
+    def sleep(self, c):
+        """
+        Creature c, done with its turn, has nothing to do until a cell next
+        to it is emptied. It is skipped until then, and ages as it wakes.
+        """
+        c.asleep = self.clock
+        if c.traditional not in self.sleepers:
+            self.sleepers[c.traditional] = self.getNeighbourTable(c.traditional).adjacent
+
+    def settle(self, c):
+        """
+        Age dormant creature c by the turns it has missed. During a turn the
+        creatures before the one taking its turn have missed this chronon's.
+        """
+        done = self.clock
+        if self.turning is not None and c.index <= self.turning:
+            done += 1
+        missed = done - 1 - c.asleep
+        if missed > 0:
+            c.age += missed
+            c.totalAge += missed
+            c.asleep = done - 1
+
+    def wake(self, c):
+        self.settle(c)
+        c.asleep = -1
+
     def isCellEmpty(self, x, y):
         """
-        If cell is None type, or contains a dead creature it is empty,
-        otherwise it is not.
+        If cell is None type it is empty, otherwise it is not.
+        Cells outside the sea are never empty.
         """
-        try:
-            if self.sea[x][y] == None:
-                return True
-            elif self.sea[x][y].isAlive():
-                return False
-            else:
-                return True
-        except IndexError:
-            return False
+        if 0 <= x < self.maxX and 0 <= y < self.maxY:
+            return self.cells[x * self.maxY + y] is None
+        return False
 
     def setCell(self, x, y, c):
         """
@@ -63,27 +200,37 @@ class Sea(object):
         Return True if possible and false if not.
         """
         result = False
-        try:
-            if self.isCellEmpty(x,y):
-                self.sea[x][y] = c
-                result = True
-        except IndexError:
-            pass
+        if self.isCellEmpty(x,y):
+            self.putCell(x * self.maxY + y, c)
+            result = True
         return result
 
     def getCell(self, x, y):
-        try:
-            return self.sea[x][y]
-        except IndexError:
-            return None
+        if 0 <= x < self.maxX and 0 <= y < self.maxY:
+            return self.cells[x * self.maxY + y]
+        return None
 
     def emptyCell(self, x, y):
-        if type(self.sea[x][y]) is Shark:
+        i = x * self.maxY + y
+        if type(self.cells[i]) is Shark:
             self.sharks -= 1
-        elif type(self.sea[x][y]) is Fish:
+        elif type(self.cells[i]) is Fish:
             self.fishes -= 1
 
-        self.sea[x][y] = None
+        self.putCell(i, None)
+
+    def moveCreature(self, c, x, y):
+        """
+        Move creature c to cell (x,y), if the cell is empty.
+        The creature's position is updated in place.
+        Return True if possible and false if not.
+        """
+        if self.isCellEmpty(x, y):
+            self.putCell(x * self.maxY + y, c)
+            self.putCell(c.pos.index, None)
+            c.pos.setSeaPosition(x, y)
+            return True
+        return False
 
     def getSharks(self):
         return self.sharks
@@ -98,9 +245,12 @@ class Sea(object):
         """
         if self.isCellEmpty(x, y):
             pos = SeaPosition(x,y,self)
-            creature = newCreature(self, pos, t, spawn, starve, self.random, parent)
-            self.setCell(x,y, creature)
+            creature = newCreature(self, pos, t, spawn, starve, parent)
+            self.putCell(x * self.maxY + y, creature)
+            creature.index = len(self.creatures)
             self.creatures.append(creature)
+            if self.ages is not None:
+                self.countAge(creature, 1)
             if type(creature) is Shark:
                 self.sharks += 1
             elif type(creature) is Fish:
@@ -109,29 +259,198 @@ class Sea(object):
         else:
             return None
 
+    def removeCreature(self, c):
+        """
+        Note that creature c has died, it leaves self.creatures at cleanCreatures.
+        """
+        self.dead.append(c)
+        if c.asleep >= 0:
+            self.wake(c)
+        if self.ages is not None:
+            self.countAge(c, -1)
+        if self.metrics is not None:
+            self.metrics.count(c.KIND, "deaths")
+
     def cleanCreatures(self):
         """
-        Remove the dead creatures from the dictionary of self.creatures.
+        Remove the dead creatures from self.creatures, keeping the order
+        of the living. Only the creatures after the first of the dead move
+        down, and are given their new index.
         """
-        self.sharks = 0
-        self.fishes = 0
-        aliveCreatures = []
-        for c in self.creatures:
-            if c.isAlive():
-                aliveCreatures.append(c)
-                if type(c) is Shark:
-                    self.sharks += 1
-                elif type(c) is Fish:
-                    self.fishes += 1
+        if not self.dead:
+            return
+        creatures = self.creatures
+        first = min(c.index for c in self.dead)
+        creatures[first:] = [c for c in creatures[first:] if c.alive]
+        for i in range(first, len(creatures)):
+            creatures[i].index = i
+        for c in self.dead:
+            c.index = -1
+        self.dead = []
 
-        self.creatures = aliveCreatures
+    def turn(self):
+        """
+        One chronon, every creature takes its turn, then the dead are removed.
+        Creatures born during the chronon are appended, and wait for the next.
+        """
+        creatures = self.creatures
+        self.turnEnd = len(creatures)
+        if self.metrics is None:
+            for i in range(self.turnEnd):
+                c = creatures[i]
+                if c.asleep < 0:
+                    self.turning = i
+                    c.turn()
+        else:
+            dormant = 0
+            for i in range(self.turnEnd):
+                c = creatures[i]
+                if c.asleep < 0:
+                    self.turning = i
+                    c.turn()
+                else:
+                    dormant += 1
+            # the turns a dormant fish would have taken, looking and finding nothing
+            self.metrics.count("fish", "turns", dormant)
+            self.metrics.count("fish", "lookups", dormant)
+        self.turning = None
+        self.clock += 1
+        if self.metrics is None:
+            self.cleanCreatures()
+        else:
+            before = time.perf_counter()
+            self.cleanCreatures()
+            self.metrics.addTime("cleanCreatures", time.perf_counter() - before)
+
+    def enableAges(self):
+        """
+        Keep the age histograms from now on, rather than walk the creatures.
+        A creature is counted under its epoch, the chronon at which it was
+        age 0. Ageing leaves the epoch as it is, so only births, deaths
+        and spawns, when the age goes back to 0, change the counts.
+        """
+        if self.ages is None:
+            self.ages = {Shark: {}, Fish: {}}
+            for creature in self.creatures:
+                if creature.alive:
+                    self.countAge(creature, 1)
+
+    def ageEpoch(self, c):
+        """
+        Return the epoch of creature c from its age. During a turn the
+        creatures that have taken theirs, and those born in it, are
+        a chronon ahead of the rest.
+        """
+        if self.turning is not None and (c.index <= self.turning or c.index >= self.turnEnd):
+            return self.clock + 1 - c.age
+        return self.clock - c.age
+
+    def countAge(self, c, n):
+        """
+        Add n to the count of the epoch of creature c.
+        """
+        if c.asleep >= 0:
+            self.settle(c)
+        epochs = self.ages[type(c)]
+        epoch = self.ageEpoch(c)
+        count = epochs.get(epoch, 0) + n
+        if count:
+            epochs[epoch] = count
+        else:
+            del epochs[epoch]
+
+    def getAges(self, creatureType):
+        """
+        Return a dictionary of age: count for the creatures of creatureType,
+        from the histograms kept since enableAges.
+        """
+        self.enableAges()
+        return {self.clock - epoch: count for epoch, count in self.ages[creatureType].items()}
+
+    def getSharkAges(self):
+        return self.getAges(Shark)
+
+    def getFishAges(self):
+        return self.getAges(Fish)
+
+    def getColorGrid(self):
+        """
+        Return an x by y array of 0xRRGGBB colors, the sea color for empty
+        cells and the color of the creature otherwise.
+        """
+        colors = numpy.full(self.maxX * self.maxY, 0x0000ff, dtype=numpy.uint32)
+        if self.creatures:
+            cells = numpy.fromiter((c.pos.index for c in self.creatures), dtype=numpy.int64, count=len(self.creatures))
+            colors[cells] = numpy.fromiter((c.color for c in self.creatures), dtype=numpy.uint32, count=len(self.creatures))
+        return colors.reshape(self.maxX, self.maxY)
 
     def exportSea(self):
         return [self.maxX,self.maxY]
 
+    def exportSettings(self):
+        return {"engine": "object", "maxX": self.maxX, "maxY": self.maxY, "nextID": SeaCreature.nextID}
+
+    def exportColumns(self):
+        """
+        Return a dictionary of numpy arrays, one per snapshot column, with
+        a row for every creature.
+        """
+        from seasnapshot import COLUMNS, columnType
+        creatures = self.creatures
+        n = len(creatures)
+        for c in creatures:
+            if c.asleep >= 0:
+                self.settle(c)
+        values = {
+            "type": (STATES[type(c)] for c in creatures),
+            "id": (c.creatureID for c in creatures),
+            "parent": (c.parent for c in creatures),
+            "x": (c.pos.x for c in creatures),
+            "y": (c.pos.y for c in creatures),
+            "traditional": (c.traditional for c in creatures),
+            "spawnAge": (c.spawnAge for c in creatures),
+            "starveAge": (c.starveAge for c in creatures),
+            "totalAge": (c.totalAge for c in creatures),
+            "age": (c.age for c in creatures),
+            "starve": (c.starve for c in creatures),
+        }
+        return {name: numpy.fromiter(values[name], dtype=columnType(name), count=n) for name in COLUMNS}
+
+    def restoreColumns(self, columns, nextID=None):
+        """
+        Fill an empty sea from snapshot columns, without the checks of
+        addCreature. nextID = the next creature ID to hand out.
+        """
+        from seasnapshot import COLUMNS
+        kinds = {FISH: Fish, SHARK: Shark}
+        rows = zip(*(columns[name].tolist() for name in COLUMNS))
+        for kind, ID, parent, x, y, traditional, spawnAge, starveAge, totalAge, age, starve in rows:
+            creature = kinds[kind](self, SeaPosition(x, y, self), traditional, spawnAge, starveAge, parent)
+            creature.creatureID = ID
+            creature.totalAge = totalAge
+            creature.age = age
+            creature.starve = starve
+            creature.index = len(self.creatures)
+            self.creatures.append(creature)
+            self.cells[creature.pos.index] = creature
+        self.sharks = int(numpy.count_nonzero(columns["type"] == SHARK))
+        self.fishes = int(numpy.count_nonzero(columns["type"] == FISH))
+        self.near = [] # the cells were filled without putCell, count again
+        self.ages = None
+        self.stateHash = None
+        if nextID is not None:
+            SeaCreature.nextID = nextID
+
     def setCreatureTag(self, creatureTag):
         self.creatureTag = creatureTag
         
+    def close(self):
+        """
+        The creatures are plain objects, there are no workers or files to
+        let go of.
+        """
+        pass
+
     def __str__(self):
         sharks = self.getSharks()
         fishes = self.getFishes()
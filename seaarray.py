@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:40 2026
+
+The sea of Wa-Tor held as arrays rather than as creature objects.
+Every cell has a type (empty, fish, shark), an age, a total age and a
+starve counter. A chronon applies the fish and shark rules to the whole
+sea at once, the torus neighbourhoods are found with numpy.roll.
+
+The update is synchronous: all sharks act, then all fishes act. When two
+creatures pick the same cell one of them, chosen at random, gets it and
+the others stay where they are.
+"""
+
+import numpy
+
+from seaneighbours import getOffsets
+from seajournal import EMPTY, FISH, SHARK, SeaJournal
+
+COLOR_SEA = 0x0000ff
+COLOR_SHARK = 0xFF0000
+COLOR_SHARK_HUNT = 0x660000
+COLOR_FISH = 0x00ff00
+COLOR_FISH_FLEEING = 0xffff00
+
+SPAWN_CHANCE = 0.7 # attempt to smooth out sawtooth, as SeaCreature.spawn
+
+KIND_NAMES = {SHARK: "shark", FISH: "fish"} # of the metrics
+
+class SeaArray(object):
+    """
+    A sea of x by y cells stored as numpy arrays indexed [x, y].
+    """
+    def __init__(self, x, y, traditional, sharkSpawn, sharkStarve, fishSpawn, rng):
+        """
+        Initialize an empty sea.
+        rng = numpy.random.Generator used for every decision.
+        """
+        self.maxX = x
+        self.maxY = y
+        self.traditional = traditional
+        self.sharkSpawn = sharkSpawn
+        self.sharkStarve = sharkStarve
+        self.fishSpawn = fishSpawn
+        self.random = rng
+        self.search = getOffsets(traditional)
+        self.dx = numpy.array([dx for dx, dy in self.search])
+        self.dy = numpy.array([dy for dx, dy in self.search])
+        self.allocate()
+        self.journal = None
+        self.metrics = None
+
+    def allocate(self):
+        """
+        Create the state arrays of an empty sea.
+        """
+        x, y = self.maxX, self.maxY
+        self.cells = numpy.zeros((x, y), dtype=numpy.int8)
+        self.age = numpy.zeros((x, y), dtype=numpy.int32)
+        self.totalAge = numpy.zeros((x, y), dtype=numpy.int32)
+        self.starve = numpy.zeros((x, y), dtype=numpy.int32)
+        self.alert = numpy.zeros((x, y), dtype=bool) # hunting shark, fleeing fish
+
+    def getMaxX(self):
+        return self.maxX
+
+    def getMaxY(self):
+        return self.maxY
+
+    def enableJournal(self):
+        """
+        Start recording changed cells, return the SeaJournal.
+        Changes are found by comparing the cells before and after each turn.
+        """
+        if self.journal is None:
+            self.journal = SeaJournal()
+        return self.journal
+
+    def pullJournal(self, net=True):
+        return self.journal.pull(net)
+
+    def enableMetrics(self, metrics=None):
+        """
+        Start counting what the creatures do, return the Metrics.
+        A lookup is a creature whose neighbours were looked at.
+        """
+        from seametrics import Metrics
+        self.metrics = metrics if metrics is not None else Metrics()
+        return self.metrics
+
+    def getSharks(self):
+        return int(numpy.count_nonzero(self.cells == SHARK))
+
+    def getFishes(self):
+        return int(numpy.count_nonzero(self.cells == FISH))
+
+    def populate(self, sharks, fishes):
+        """
+        Place sharks and fishes on distinct random cells, with random ages
+        to smooth things out as generateSea does for the object sea.
+        """
+        cells = self.random.choice(self.maxX * self.maxY, sharks + fishes, replace=False)
+        sharkCells = numpy.unravel_index(cells[:sharks], self.cells.shape)
+        fishCells = numpy.unravel_index(cells[sharks:], self.cells.shape)
+        self.cells[sharkCells] = SHARK
+        self.age[sharkCells] = self.random.integers(0, self.sharkSpawn, sharks)
+        self.starve[sharkCells] = self.random.integers(0, self.sharkStarve, sharks)
+        self.cells[fishCells] = FISH
+        self.age[fishCells] = self.random.integers(0, self.fishSpawn, fishes)
+        self.totalAge[:] = self.age
+
+    def neighbours(self, grid):
+        """
+        Return a (directions, x, y) stack, entry [d, x, y] holds the value
+        of grid at the d-th neighbour of (x, y).
+        """
+        return numpy.stack([numpy.roll(grid, (-dx, -dy), axis=(0, 1)) for dx, dy in self.search])
+
+    def pick(self, weights):
+        """
+        weights = (directions, n) array of non negative weights, every
+        column has at least one positive weight.
+        Return the chosen direction for each of the n columns.
+        """
+        total = numpy.cumsum(weights, axis=0)
+        r = self.random.random(weights.shape[1]) * total[-1]
+        return numpy.argmax(total > r, axis=0)
+
+    def claim(self, tx, ty):
+        """
+        Resolve creatures competing for the same target cell.
+        Return a boolean array, True for the creatures that won their cell.
+        """
+        targets = tx * self.maxY + ty
+        order = self.random.permutation(len(targets))
+        _, first = numpy.unique(targets[order], return_index=True)
+        won = numpy.zeros(len(targets), dtype=bool)
+        won[order[first]] = True
+        return won
+
+    def target(self, x, y, direction):
+        return (x + self.dx[direction]) % self.maxX, (y + self.dy[direction]) % self.maxY
+
+    def moveCells(self, x, y, tx, ty, kind):
+        """
+        Move the creatures at (x, y) to (tx, ty), leaving empty cells behind.
+        """
+        self.cells[tx, ty] = kind
+        self.age[tx, ty] = self.age[x, y]
+        self.totalAge[tx, ty] = self.totalAge[x, y]
+        self.starve[tx, ty] = self.starve[x, y]
+        self.alert[tx, ty] = self.alert[x, y]
+        self.clearCells(x, y)
+
+    def clearCells(self, x, y):
+        self.cells[x, y] = EMPTY
+        self.age[x, y] = 0
+        self.totalAge[x, y] = 0
+        self.starve[x, y] = 0
+        self.alert[x, y] = False
+
+    def birthCells(self, x, y, kind):
+        self.clearCells(x, y)
+        self.cells[x, y] = kind
+
+    def spawnOrMove(self, x, y, kind, spawnAge, weights):
+        """
+        Creatures at (x, y) either spawn into, or move to, one of their
+        neighbours, chosen by weights (directions, n).
+        """
+        spawning = (self.age[x, y] >= spawnAge) & (self.random.random(len(x)) > SPAWN_CHANCE)
+        tx, ty = self.target(x, y, self.pick(weights))
+        won = self.claim(tx, ty)
+        born = won & spawning
+        self.birthCells(tx[born], ty[born], kind)
+        self.age[x[born], y[born]] = 0
+        moved = won & ~spawning
+        self.moveCells(x[moved], y[moved], tx[moved], ty[moved], kind)
+        if self.metrics is not None:
+            self.metrics.count(KIND_NAMES[kind], "births", int(numpy.count_nonzero(born)))
+
+    def sharkTurn(self):
+        """
+        Sharks age and starve. A shark eats an adjacent fish, and may then
+        spawn where it was, otherwise it spawns or hunts, moving towards
+        fishes two spaces away.
+        """
+        sharks = self.cells == SHARK
+        self.age[sharks] += 1
+        self.totalAge[sharks] += 1
+        self.starve[sharks] += 1
+        starved = sharks & (self.starve > self.sharkStarve)
+        self.clearCells(*numpy.nonzero(starved))
+        sharks &= ~starved
+        self.alert[sharks] = False
+
+        # eat
+        fishNear = self.neighbours(self.cells == FISH)
+        hungry = sharks & fishNear.any(axis=0)
+        x, y = numpy.nonzero(hungry)
+        tx, ty = self.target(x, y, self.pick(fishNear[:, x, y]))
+        won = self.claim(tx, ty)
+        x, y, tx, ty = x[won], y[won], tx[won], ty[won]
+        self.moveCells(x, y, tx, ty, SHARK)
+        self.starve[tx, ty] = 0
+        spawning = (self.age[tx, ty] >= self.sharkSpawn) & (self.random.random(len(x)) > SPAWN_CHANCE)
+        self.birthCells(x[spawning], y[spawning], SHARK)
+        self.age[tx[spawning], ty[spawning]] = 0
+        if self.metrics is not None:
+            starvations = int(numpy.count_nonzero(starved))
+            self.metrics.count("shark", "turns", int(numpy.count_nonzero(sharks)) + starvations)
+            self.metrics.count("shark", "starvations", starvations)
+            self.metrics.count("shark", "deaths", starvations)
+            self.metrics.count("shark", "lookups", int(numpy.count_nonzero(sharks)))
+            self.metrics.count("shark", "eats", len(x))
+            self.metrics.count("fish", "deaths", len(x))
+            self.metrics.count("shark", "births", int(numpy.count_nonzero(spawning)))
+
+        # spawn or hunt
+        fishes = self.cells == FISH
+        emptyNear = self.neighbours(self.cells == EMPTY)
+        x, y = numpy.nonzero(sharks & ~hungry & emptyNear.any(axis=0))
+        free = emptyNear[:, x, y]
+        prey = self.neighbours(self.neighbours(fishes).sum(axis=0))[:, x, y] * free
+        hunting = prey.any(axis=0)
+        self.alert[x[hunting], y[hunting]] = True
+        weights = numpy.where(hunting, prey, free)
+        if self.metrics is not None:
+            self.metrics.count("shark", "lookaheads", int(numpy.count_nonzero(free)))
+        self.spawnOrMove(x, y, SHARK, self.sharkSpawn, weights)
+
+    def fishTurn(self):
+        """
+        Fishes age, then spawn or flee, moving away from sharks when there
+        is a safe space to move to.
+        """
+        fishes = self.cells == FISH
+        self.age[fishes] += 1
+        self.totalAge[fishes] += 1
+        self.alert[fishes] = False
+        if self.metrics is not None:
+            self.metrics.count("fish", "turns", int(numpy.count_nonzero(fishes)))
+            self.metrics.count("fish", "lookups", int(numpy.count_nonzero(fishes)))
+
+        emptyNear = self.neighbours(self.cells == EMPTY)
+        x, y = numpy.nonzero(fishes & emptyNear.any(axis=0))
+        free = emptyNear[:, x, y]
+        doomed = self.neighbours(self.neighbours(self.cells == SHARK).any(axis=0))[:, x, y] & free
+        safe = free & ~doomed
+        anySafe = safe.any(axis=0)
+        fleeing = anySafe & doomed.any(axis=0)
+        self.alert[x[fleeing], y[fleeing]] = True
+        weights = numpy.where(anySafe, safe, free)
+        if self.metrics is not None:
+            self.metrics.count("fish", "lookaheads", int(numpy.count_nonzero(free)))
+        self.spawnOrMove(x, y, FISH, self.fishSpawn, weights)
+
+    def turn(self):
+        """
+        One chronon, sharks then fishes.
+        """
+        if self.journal is not None:
+            before = self.cells.ravel().copy()
+        self.sharkTurn()
+        self.fishTurn()
+        if self.journal is not None:
+            after = self.cells.ravel()
+            changed = numpy.flatnonzero(before != after)
+            self.journal.recordArrays(changed, before[changed], after[changed])
+
+    def ageHistogram(self, kind):
+        ages, counts = numpy.unique(self.age[self.cells == kind], return_counts=True)
+        return dict(zip(ages.tolist(), counts.tolist()))
+
+    def getStateHash(self):
+        """
+        Return the Zobrist hash of the cells, as Sea.getStateHash, worked
+        out from the whole sea.
+        """
+        from seasteady import gridHash
+        return gridHash(self.cells.ravel())
+
+    def getSharkAges(self):
+        return self.ageHistogram(SHARK)
+
+    def getFishAges(self):
+        return self.ageHistogram(FISH)
+
+    def exportSettings(self):
+        return {"engine": "numpy", "maxX": self.maxX, "maxY": self.maxY, "traditional": self.traditional,
+                "sharkSpawn": self.sharkSpawn, "sharkStarve": self.sharkStarve, "fishSpawn": self.fishSpawn}
+
+    def exportColumns(self):
+        """
+        Return a dictionary of numpy arrays, one per snapshot column, with
+        a row for every creature. Array creatures have no ID or parent.
+        """
+        x, y = numpy.nonzero(self.cells)
+        kind = self.cells[x, y]
+        sharks = kind == SHARK
+        n = len(x)
+        return {
+            "type": kind,
+            "id": numpy.zeros(n, dtype=numpy.int64),
+            "parent": numpy.zeros(n, dtype=numpy.int64),
+            "x": x.astype(numpy.int64),
+            "y": y.astype(numpy.int64),
+            "traditional": numpy.full(n, self.traditional, dtype=numpy.bool_),
+            "spawnAge": numpy.where(sharks, self.sharkSpawn, self.fishSpawn).astype(numpy.int64),
+            "starveAge": numpy.where(sharks, self.sharkStarve, 99).astype(numpy.int64),
+            "totalAge": self.totalAge[x, y].astype(numpy.int64),
+            "age": self.age[x, y].astype(numpy.int64),
+            "starve": self.starve[x, y].astype(numpy.int64),
+        }
+
+    def restoreColumns(self, columns, nextID=None):
+        """
+        Fill an empty sea from snapshot columns.
+        """
+        x, y = columns["x"], columns["y"]
+        self.cells[x, y] = columns["type"]
+        self.totalAge[x, y] = columns["totalAge"]
+        self.age[x, y] = columns["age"]
+        self.starve[x, y] = columns["starve"]
+
+    def getColorGrid(self):
+        """
+        Return an x by y array of 0xRRGGBB colors, as SeaDisplay shows them.
+        """
+        colors = numpy.full(self.cells.shape, COLOR_SEA, dtype=numpy.uint32)
+        colors[self.cells == FISH] = COLOR_FISH
+        colors[(self.cells == FISH) & self.alert] = COLOR_FISH_FLEEING
+        colors[self.cells == SHARK] = COLOR_SHARK
+        colors[(self.cells == SHARK) & self.alert] = COLOR_SHARK_HUNT
+        return colors
+
+    def close(self):
+        pass
+
+    def __str__(self):
+        sharks = self.getSharks()
+        fishes = self.getFishes()
+        positions = self.maxX * self.maxY
+        empty = positions - sharks - fishes
+        return "Sharks: %d Fishes: %d Empty: %d" % (sharks, fishes, empty)
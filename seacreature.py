@@ -10,15 +10,18 @@ SeaCreature is the supper class from which the creatures
 in the simulation are created.
 """
 
-from seaposition import *
-from sea import *
+from seaneighbours import NEAR_SHARK
 
 class SeaCreature(object):
     """
     Super class of all sea creatures.
+    Creatures are kept compact, without a __dict__, the random number
+    generator is the one of the sea they live in.
     """
+    __slots__ = ("color", "sea", "pos", "traditional", "age", "totalAge", "spawnAge",
+                 "starve", "starveAge", "alive", "creatureID", "parent", "index", "asleep")
     nextID = 1
-    def __init__(self, sea, pos, traditional, spawnAge, starveAge, random, parent):
+    def __init__(self, sea, pos, traditional, spawnAge, starveAge, parent):
         """
         Simple creature, reproduces quickly, does not eat, and never dies except if eaten.
         """
@@ -32,10 +35,11 @@ class SeaCreature(object):
         self.starve = 0
         self.starveAge = starveAge # set but not used by basic creature
         self.alive = True
-        self.random = random
         self.creatureID = SeaCreature.nextID
         SeaCreature.nextID += 1
         self.parent = parent
+        self.index = -1 # position in sea.creatures
+        self.asleep = -1 # chronon it was last aged in while dormant, -1 when awake
 
     def getPosition(self):
         return self.pos
@@ -62,8 +66,16 @@ class SeaCreature(object):
         return self.alive
     
     def getAge(self):
+        self.settle()
         return self.age
 
+    def settle(self):
+        """
+        Bring the age of a dormant creature up to date.
+        """
+        if self.asleep >= 0:
+            self.sea.settle(self)
+
     def died(self):
         """
         Remove from sea, and set dead (alive = False)
@@ -71,16 +83,24 @@ class SeaCreature(object):
         x,y = self.pos.getSeaPosition()
         self.sea.emptyCell(x,y)
         self.alive = False
+        self.sea.removeCreature(self)
 
     def spawn(self,free):
         """
         If old enough, and there is free space, spawn.
         """
         if self.age >= self.spawnAge:
-            if self.random.random() > 0.7: # attempt to smooth out sawtooth
-                spawnX, spawnY = self.random.choice(free)
+            if self.sea.random.random() > 0.7: # attempt to smooth out sawtooth
+                spawnX, spawnY = self.sea.random.choice(free)
                 self.sea.addCreature(spawnX, spawnY, type(self), self.traditional, self.spawnAge, self.creatureID, self.starveAge)
-                self.age = 0
+                if self.sea.ages is None:
+                    self.age = 0
+                else:
+                    self.sea.countAge(self, -1)
+                    self.age = 0
+                    self.sea.countAge(self, 1)
+                if self.sea.metrics is not None:
+                    self.sea.metrics.count(self.KIND, "births")
                 return True
             else:
                 return False
@@ -91,11 +111,8 @@ class SeaCreature(object):
         """
         Move to a space it is empty.
         """
-        newX, newY = self.random.choice(empty)
-        oldX, oldY = self.pos.getSeaPosition()
-        if self.sea.setCell(newX, newY, self):
-            self.sea.emptyCell(oldX, oldY)
-            self.pos = SeaPosition(newX, newY, self.sea)
+        newX, newY = self.sea.random.choice(empty)
+        self.sea.moveCreature(self, newX, newY)
 
     def turn(self):
         """
@@ -110,7 +127,13 @@ class SeaCreature(object):
                     self.move(empty)
 
     def setAge(self,age):
-        self.age = age
+        self.settle()
+        if self.sea.ages is None:
+            self.age = age
+        else:
+            self.sea.countAge(self, -1)
+            self.age = age
+            self.sea.countAge(self, 1)
 
     def setTotalAge(self,age):
         self.totalAge = age
@@ -119,6 +142,7 @@ class SeaCreature(object):
         self.starve = starve
 
     def exportCreature(self):
+        self.settle()
         return [self.creatureID, self.parent, self.pos.getX(), self.pos.getY(), self.traditional, self.spawnAge, self.starveAge, self.alive, self.totalAge, self.age, self.starve]
 
     def __str__(self):
@@ -132,9 +156,11 @@ class Shark(SeaCreature):
     """
     COLOR_NORMAL = 0xFF0000
     COLOR_HUNT = 0x660000
+    KIND = "shark" # of its metrics
+    __slots__ = ()
 
-    def __init__(self, sea, pos, traditional, spawnAge, starveAge, random, parent):
-        SeaCreature.__init__(self, sea, pos, traditional, spawnAge, starveAge, random, parent)
+    def __init__(self, sea, pos, traditional, spawnAge, starveAge, parent):
+        SeaCreature.__init__(self, sea, pos, traditional, spawnAge, starveAge, parent)
         self.setColor(Shark.COLOR_NORMAL)
 
     def hunt(self,nearby):
@@ -144,12 +170,22 @@ class Shark(SeaCreature):
         nearby = list of all empty adjacent positions. 
         """
         prefered = []
-        for n in nearby:
-            nearPos = SeaPosition(n[0], n[1], self.sea)
-            empty, occupied = nearPos.getAdjacent(self.traditional)
-            if len(occupied) > 1:
-                for o in occupied:
-                    if o != n and type(self.sea.getCell(o[0],o[1])) is Fish:
+        if self.sea.metrics is not None:
+            self.sea.metrics.count("shark", "lookaheads", len(nearby))
+        near = self.sea.getNearCounts(self.traditional)
+        if near is not None:
+            maxY = self.sea.maxY
+            for n in nearby:
+                # once per fish next to it, the more fishes the more likely
+                fishes = near[n[0] * maxY + n[1]] % NEAR_SHARK
+                if fishes:
+                    prefered.extend([n] * fishes)
+        else:
+            table = self.sea.getNeighbourTable(self.traditional)
+            cells = self.sea.cells
+            for n in nearby:
+                for o in table.adjacent[table.index(n[0], n[1])]:
+                    if type(cells[o]) is Fish:
                         prefered.append(n)
         if len(prefered) > 0:
             self.move(prefered)
@@ -168,14 +204,12 @@ class Shark(SeaCreature):
             if type(self.sea.getCell(x,y)) is Fish:
                 fishes.append(cell)
         if len(fishes) > 0:
-            newX, newY = self.random.choice(fishes)
+            newX, newY = self.sea.random.choice(fishes)
             self.sea.getCell(newX,newY).died()
-            self.sea.emptyCell(newX, newY)
-            oldX, oldY = self.pos.getSeaPosition()
-            if self.sea.setCell(newX, newY, self):
-                self.setPosition(SeaPosition(newX,newY,self.sea))
-                self.sea.emptyCell(oldX, oldY)
+            if self.sea.moveCreature(self, newX, newY):
                 self.starve = 0
+                if self.sea.metrics is not None:
+                    self.sea.metrics.count("shark", "eats")
                 return True
 
     def turn(self):
@@ -188,12 +222,19 @@ class Shark(SeaCreature):
             self.age += 1
             self.totalAge += 1
             self.starve += 1
+            metrics = self.sea.metrics
+            if metrics is not None:
+                metrics.count("shark", "turns")
             if self.starve > self.starveAge:
+                if metrics is not None:
+                    metrics.count("shark", "starvations")
                 self.died()
             else:
                 self.setColor(Shark.COLOR_NORMAL)
                 spawnX, spawnY = self.pos.getSeaPosition()
                 empty, occupied = self.pos.getAdjacent(self.traditional)
+                if metrics is not None:
+                    metrics.count("shark", "lookups")
                 if len(occupied) > 0:
                     if self.eat(occupied):
                         self.spawn([(spawnX, spawnY)])
@@ -217,9 +258,11 @@ class Fish(SeaCreature):
     """
     COLOR_NORMAL = 0x00ff00
     COLOR_FLEEING = 0xffff00
+    KIND = "fish"
+    __slots__ = ()
 
-    def __init__(self, sea, pos, traditional, spawnAge, starveAge, random, parent):
-        SeaCreature.__init__(self, sea, pos, traditional, spawnAge, starveAge, random, parent)
+    def __init__(self, sea, pos, traditional, spawnAge, starveAge, parent):
+        SeaCreature.__init__(self, sea, pos, traditional, spawnAge, starveAge, parent)
         self.setColor(Fish.COLOR_NORMAL)
 
     def flee(self,nearby):
@@ -230,13 +273,23 @@ class Fish(SeaCreature):
         """
         safespace = []
         safe = True
-        for n in nearby:
-            nearPos = SeaPosition(n[0], n[1], self.sea)
-            empty, occupied = nearPos.getAdjacent(self.traditional)
-            if len(occupied) > 0:
+        if self.sea.metrics is not None:
+            self.sea.metrics.count("fish", "lookaheads", len(nearby))
+        near = self.sea.getNearCounts(self.traditional)
+        if near is not None:
+            maxY = self.sea.maxY
+            for n in nearby:
+                if near[n[0] * maxY + n[1]] < NEAR_SHARK:
+                    safespace.append(n)
+                else:
+                    safe = False
+        else:
+            table = self.sea.getNeighbourTable(self.traditional)
+            cells = self.sea.cells
+            for n in nearby:
                 no_doom = True
-                for o in occupied:
-                    if o != n and type(self.sea.getCell(o[0],o[1])) is Shark:
+                for o in table.adjacent[table.index(n[0], n[1])]:
+                    if type(cells[o]) is Shark:
                         no_doom = False
                         safe = False
                 if no_doom:
@@ -258,10 +311,16 @@ class Fish(SeaCreature):
             self.age += 1
             self.totalAge += 1
             empty, occupied = self.pos.getAdjacent(self.traditional)
+            if self.sea.metrics is not None:
+                self.sea.metrics.count("fish", "turns")
+                self.sea.metrics.count("fish", "lookups")
             self.setColor(Fish.COLOR_NORMAL)
             if len(empty) > 0:
                 if not self.spawn(empty):
                     self.flee(empty)
+            else:
+                # hemmed in, the turns to come are the same until a neighbour leaves
+                self.sea.sleep(self)
 
     def exportCreature(self):
         return [type(self)] + SeaCreature.exportCreature(self)
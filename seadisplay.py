@@ -6,25 +6,37 @@ Created on Tue Dec 12 12:04:29 2017
 @author: michael
 """
 
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
 import numpy
-import pygame
 
-from sea import *
+pygame = None # loaded by the first SeaDisplay, a headless run never imports it
+
+def loadPygame():
+    global pygame
+    import pygame
 
 class SeaDisplay(object):
     """
     Display the sea of x by y cells.
     Each cell can hold one thing or be empty (None).
+    The sea is drawn from an x by y array of colors, scaled up to cellsize.
     """
-    def __init__(self, sea, cellsize, filenumber=0):
+    def __init__(self, sea, cellsize, filenumber=0, incremental=False):
         """
         Initialize screen
+        incremental = redraw only the cells that changed since the last frame.
         """
+        loadPygame()
         self.sea = sea
         self.maxX = sea.getMaxX()
         self.maxY = sea.getMaxY()
         self.fileNumber = filenumber
         self.cellsize = cellsize
+        self.incremental = incremental
+        self.lastColors = None
         self.screen = self.initScreen()
         pygame.display.set_caption("Wa-Tor")
 
@@ -36,6 +48,7 @@ class SeaDisplay(object):
         Return the screen.
         Allows addition of new characteristics.
         """
+        self.lastColors = None
         return pygame.display.set_mode((self.maxX*self.cellsize, self.maxY*self.cellsize))
 
     def setMaxX(self, x):
@@ -49,12 +62,42 @@ class SeaDisplay(object):
 
     def getCellSize(self):
         return self.cellsize
-    
-    def showImage(self, sea, save=False):
+
+    def drawColors(self, colors):
+        """
+        Draw an x by y array of colors to the screen, each color filling a
+        cellsize square. In incremental mode only the cells whose color
+        changed since the last frame are drawn.
+        Return the list of rectangles to update, None for the whole screen.
+        """
+        if self.screen.get_bitsize() != 32:
+            # not a 0xRRGGBB screen, let pygame convert and scale.
+            cells = pygame.Surface((self.maxX, self.maxY), depth=32)
+            pygame.surfarray.blit_array(cells, colors)
+            pygame.transform.scale(cells, self.screen.get_size(), self.screen)
+            return None
+
+        # pixels[x*cellsize + i, y*cellsize + j] is pixel (i, j) of cell (x, y)
+        pixels = pygame.surfarray.pixels2d(self.screen).reshape(self.maxX, self.cellsize, self.maxY, self.cellsize)
+        rects = None
+        if self.incremental and self.lastColors is not None:
+            x, y = numpy.nonzero(colors != self.lastColors)
+            pixels[x, :, y, :] = colors[x, y][:, None, None]
+            if len(x) < (self.maxX * self.maxY) // 4:
+                rects = [(self.cellsize * cx, self.cellsize * cy, self.cellsize, self.cellsize)
+                         for cx, cy in zip(x.tolist(), y.tolist())]
+        else:
+            pixels[...] = colors[:, None, :, None]
+        del pixels # unlock the screen
+        self.lastColors = colors
+        return rects
+
+    def showImage(self, sea, save=False, colors=None):
         """
         Show the sharks, fishes, empty sea as a red, green, or blue pixel, respectively.
-        sea = array[x,y] of creatures.
+        sea = Sea or SeaArray, drawn from its getColorGrid().
         save = write to file if True (save as png).
+        colors = sea.getColorGrid(), if already known.
         """
         result = True
         for event in pygame.event.get():
@@ -67,22 +110,14 @@ class SeaDisplay(object):
             self.setMaxX(sea.getMaxX())
             self.setMaxY(sea.getMaxY())
             self.screen = self.initScreen()
-            
-        screenArray = numpy.zeros((self.maxX,self.maxY))
-        for y in range(self.maxY-1,-1,-1):
-            for x in range(self.maxX):
-                c = sea.getCell(x,y)
-                pixelColor = self.seaColor
-                if c is not None:
-                    if c.isAlive(): # an empty cell 
-                        pixelColor = c.getColor()
-                screenArray[x][y] = pixelColor
-                pygame.draw.rect(self.screen, pixelColor, 
-                    [self.cellsize * x, 
-                    self.cellsize * y, 
-                    self.cellsize, self.cellsize])
-#        pygame.surfarray.blit_array(self.screen, screenArray)
-        pygame.display.flip()
+
+        if colors is None:
+            colors = sea.getColorGrid()
+        rects = self.drawColors(colors)
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
         if save:
             pygame.image.save(self.screen, ("images/wator_%06d.png" % self.fileNumber))
         self.fileNumber += 1
@@ -94,3 +129,165 @@ class SeaDisplay(object):
 
     def exportDisplay(self):
         return [self.fileNumber, self.cellsize]
+
+
+class NullDisplay(SeaDisplay):
+    """
+    A display that shows nothing, for running without a screen.
+    It keeps the file number and cell size, so that checkpoints can be
+    restored to a real display.
+    """
+    def __init__(self, sea, cellsize, filenumber=0, incremental=False):
+        self.sea = sea
+        self.maxX = sea.getMaxX()
+        self.maxY = sea.getMaxY()
+        self.fileNumber = filenumber
+        self.cellsize = cellsize
+        self.incremental = incremental
+        self.lastColors = None
+        self.screen = None
+
+        self.seaColor = 0x0000ff
+
+    def initScreen(self):
+        return None
+
+    def showImage(self, sea, save=False, colors=None):
+        self.fileNumber += 1
+        return True
+
+    def Quit(self):
+        pass
+
+
+def saveImage(colors, cellsize, path):
+    """
+    Save an x by y array of colors as a png of cellsize squares, as
+    SeaDisplay draws it, without a screen.
+    """
+    loadPygame()
+    cells = pygame.Surface(colors.shape, depth=32)
+    pygame.surfarray.blit_array(cells, colors)
+    pygame.image.save(pygame.transform.scale(cells, (colors.shape[0] * cellsize, colors.shape[1] * cellsize)), path)
+
+class ColorGrid(object):
+    """
+    The colors of a published frame, drawn by a SeaDisplay as if a sea.
+    """
+    def __init__(self, colors):
+        self.colors = colors
+
+    def getMaxX(self):
+        return self.colors.shape[0]
+
+    def getMaxY(self):
+        return self.colors.shape[1]
+
+    def getColorGrid(self):
+        return self.colors
+
+def render(name, maxX, maxY, cellsize, incremental, framerate, lock, published, taken, stopped, closing):
+    """
+    The renderer process of a DetachedDisplay. Draw the latest published
+    frame at most once per framerate seconds, and pass a window close
+    back through stopped.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    grid = numpy.ndarray((maxX, maxY), dtype=numpy.uint32, buffer=memory.buf)
+    frame = ColorGrid(grid.copy())
+    view = SeaDisplay(frame, cellsize, 0, incremental)
+    while not closing.is_set():
+        before = time.time()
+        colors = None
+        with lock:
+            if taken.value != published.value:
+                colors = grid.copy()
+                taken.value = published.value
+        if colors is not None:
+            frame.colors = colors
+            if not view.showImage(frame, False, colors):
+                stopped.set()
+        else:
+            # nothing new, keep the window responsive
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    stopped.set()
+        time.sleep(max(framerate - (time.time() - before), 0.002))
+    view.Quit()
+    del grid
+    memory.close()
+
+class DetachedDisplay(SeaDisplay):
+    """
+    A display drawn by a renderer process of its own, so that the
+    simulation does not wait for the screen. showImage publishes the
+    colors of the sea to shared memory and returns at once, the renderer
+    draws the latest frame at the display rate. A frame is dropped, and
+    its colors are not even computed, while the renderer has not taken
+    the one before. Closing the window ends the run as with SeaDisplay.
+    framerate = seconds between the frames drawn, 0.0 as fast as drawn.
+    """
+    def __init__(self, sea, cellsize, filenumber=0, incremental=False, framerate=0.0):
+        self.sea = sea
+        self.maxX = sea.getMaxX()
+        self.maxY = sea.getMaxY()
+        self.fileNumber = filenumber
+        self.cellsize = cellsize
+        self.incremental = incremental
+        self.framerate = framerate
+        self.lastColors = None
+        self.screen = None
+        self.process = None
+        self.start()
+
+        self.seaColor = 0x0000ff
+
+    def start(self):
+        """
+        Share a frame of the current size and start the renderer.
+        """
+        self.memory = shared_memory.SharedMemory(create=True, size=self.maxX * self.maxY * 4)
+        self.grid = numpy.ndarray((self.maxX, self.maxY), dtype=numpy.uint32, buffer=self.memory.buf)
+        self.lock = multiprocessing.Lock()
+        self.published = multiprocessing.Value("q", 0, lock=False) # frames published, and taken by the renderer
+        self.taken = multiprocessing.Value("q", 0, lock=False)
+        self.stopped = multiprocessing.Event()
+        self.closing = multiprocessing.Event()
+        self.process = multiprocessing.Process(target=render, args=(self.memory.name, self.maxX, self.maxY, self.cellsize, self.incremental,
+                                                                    self.framerate, self.lock, self.published, self.taken, self.stopped, self.closing),
+                                               name="SeaRenderer", daemon=True)
+        self.process.start()
+
+    def initScreen(self):
+        self.Quit()
+        self.start()
+        return None
+
+    def showImage(self, sea, save=False, colors=None):
+        if self.maxX != sea.getMaxX() or self.maxY != sea.getMaxY():
+            self.setMaxX(sea.getMaxX())
+            self.setMaxY(sea.getMaxY())
+            self.screen = self.initScreen()
+
+        # the renderer is behind, nothing to publish unless saving
+        wanted = self.taken.value == self.published.value
+        if colors is None and (wanted or save):
+            colors = sea.getColorGrid()
+        if wanted:
+            with self.lock:
+                self.grid[...] = colors
+                self.published.value += 1
+        if save:
+            saveImage(colors, self.cellsize, "images/wator_%06d.png" % self.fileNumber)
+        self.fileNumber += 1
+
+        return not self.stopped.is_set() and self.process.is_alive()
+
+    def Quit(self):
+        if self.process is not None:
+            self.closing.set()
+            self.process.join()
+            self.process = None
+            del self.grid
+            self.memory.close()
+            self.memory.unlink()
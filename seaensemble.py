@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 24 10:41:22 2026
+
+An ensemble of replica seas, the same settings with different seeds,
+advanced together. The state of every replica is stacked along a leading
+axis, [replica, x, y], and a chronon is the three phases of the parallel
+sea applied to the whole stack, so the interpreter overhead of a phase
+is paid once for all the replicas.
+
+Every replica draws its random numbers from streams of its own seed,
+and replica r with seed s is the sea of --engine parallel --seed s.
+A replica finishes when its sharks or its fishes die out, or when it is
+finished from outside, e.g. on a steady state. Finished replicas are
+left out of the stack and keep their last state.
+"""
+
+import numpy
+
+from seajournal import FISH, SHARK
+from seaparallel import FIELDS, Phases
+from searandom import STREAMS, mix64
+from seasteady import gridHash
+
+# the population of a replica at a chronon
+SERIES = numpy.dtype([("chronon", "<i8"), ("sharks", "<i8"), ("fishes", "<i8"), ("empty", "<i8")])
+
+class EnsemblePhases(Phases):
+    """
+    The phases of a chronon over a [replica, x, y] stack of state arrays.
+    Cell keys are flat indices into the stack, a replica's random streams
+    use its seed and the index of the cell within the replica.
+    seeds = uint64 array, the seeds of the replicas of the stack.
+    """
+    def __init__(self, maxX, maxY, traditional, sharkSpawn, sharkStarve, fishSpawn, seeds):
+        Phases.__init__(self, maxX, maxY, traditional, sharkSpawn, sharkStarve, fishSpawn, None)
+        self.seeds = seeds
+        self.cellsPerReplica = maxX * maxY
+
+    def around(self, cells, shape):
+        replicas, rows, columns = shape
+        replica, cell = numpy.divmod(cells, rows * columns)
+        x, y = numpy.divmod(cell, columns)
+        return (replica[:, None] * (rows * columns) + ((x[:, None] + self.dx) % rows) * columns
+                + (y[:, None] + self.dy) % columns)
+
+    def counts(self, grid):
+        total = numpy.zeros(grid.shape, dtype=numpy.int8)
+        for dx, dy in self.search:
+            total += numpy.roll(grid, (-dx, -dy), axis=(1, 2))
+        return total.ravel()
+
+    def bits(self, chronon, stream, keys):
+        """
+        cellBits of each cell with the seed of its replica.
+        """
+        replica, cell = numpy.divmod(keys, numpy.uint64(self.cellsPerReplica))
+        counter = numpy.array([chronon * STREAMS + stream], dtype=numpy.uint64)
+        bases = mix64(self.seeds ^ mix64(counter))
+        return mix64(cell ^ bases[replica])
+
+    def uniforms(self, chronon, stream, keys):
+        return (self.bits(chronon, stream, keys) >> numpy.uint64(11)).astype(numpy.float64) * 2.0**-53
+
+class ReplicaView(object):
+    """
+    The counts and state hash of one replica, for a SteadyState.
+    """
+    def __init__(self, ensemble, replica):
+        self.ensemble = ensemble
+        self.replica = replica
+
+    def getMaxX(self):
+        return self.ensemble.maxX
+
+    def getMaxY(self):
+        return self.ensemble.maxY
+
+    def getSharks(self):
+        return int(numpy.count_nonzero(self.ensemble.cells[self.replica] == SHARK))
+
+    def getFishes(self):
+        return int(numpy.count_nonzero(self.ensemble.cells[self.replica] == FISH))
+
+    def getStateHash(self):
+        return gridHash(self.ensemble.cells[self.replica].ravel())
+
+    def __str__(self):
+        sharks = self.getSharks()
+        fishes = self.getFishes()
+        return "Sharks: %d Fishes: %d Empty: %d" % (sharks, fishes, self.getMaxX() * self.getMaxY() - sharks - fishes)
+
+class SeaEnsemble(object):
+    """
+    len(seeds) replica seas of x by y cells, stored as numpy arrays indexed
+    [replica, x, y].
+    """
+    def __init__(self, seeds, x, y, traditional, sharkSpawn, sharkStarve, fishSpawn):
+        """
+        seeds = the seed of each replica, as --seed.
+        """
+        self.maxX = x
+        self.maxY = y
+        self.traditional = traditional
+        self.sharkSpawn = sharkSpawn
+        self.sharkStarve = sharkStarve
+        self.fishSpawn = fishSpawn
+        self.replicas = len(seeds)
+        # as SeaParallel, the generator of a seed draws the seed of the streams first
+        self.randoms = [numpy.random.default_rng(seed) for seed in seeds]
+        self.seeds = numpy.array([int(rng.integers(2**63)) for rng in self.randoms], dtype=numpy.uint64)
+        self.phases = EnsemblePhases(x, y, traditional, sharkSpawn, sharkStarve, fishSpawn, self.seeds)
+        shape = (self.replicas, x, y)
+        for name, dtype in FIELDS:
+            setattr(self, name, numpy.zeros(shape, dtype=dtype))
+        self.chronon = 0
+        self.active = numpy.ones(self.replicas, dtype=bool)
+        self.ended = numpy.full(self.replicas, -1, dtype=numpy.int64) # chronon a replica finished at
+        self.series = []
+        self.keys = {}
+
+    def getMaxX(self):
+        return self.maxX
+
+    def getMaxY(self):
+        return self.maxY
+
+    def populate(self, sharks, fishes):
+        """
+        Place sharks and fishes in every replica, as SeaArray.populate does
+        with the generator of the replica's seed.
+        """
+        for replica, rng in enumerate(self.randoms):
+            cells = rng.choice(self.maxX * self.maxY, sharks + fishes, replace=False)
+            sharkCells = (replica,) + numpy.unravel_index(cells[:sharks], (self.maxX, self.maxY))
+            fishCells = (replica,) + numpy.unravel_index(cells[sharks:], (self.maxX, self.maxY))
+            self.cells[sharkCells] = SHARK
+            self.age[sharkCells] = rng.integers(0, self.sharkSpawn, sharks)
+            self.starve[sharkCells] = rng.integers(0, self.sharkStarve, sharks)
+            self.cells[fishCells] = FISH
+            self.age[fishCells] = rng.integers(0, self.fishSpawn, fishes)
+        self.totalAge[:] = self.age
+        self.record()
+
+    def getReplicaSharks(self):
+        return numpy.count_nonzero(self.cells == SHARK, axis=(1, 2))
+
+    def getReplicaFishes(self):
+        return numpy.count_nonzero(self.cells == FISH, axis=(1, 2))
+
+    def getSharks(self):
+        return int(self.getReplicaSharks().sum())
+
+    def getFishes(self):
+        return int(self.getReplicaFishes().sum())
+
+    def getReplica(self, replica):
+        return ReplicaView(self, replica)
+
+    def record(self):
+        """
+        Note the population of the replicas that ran this chronon, and
+        finish those that died out.
+        """
+        sharks = self.getReplicaSharks()
+        fishes = self.getReplicaFishes()
+        running = numpy.flatnonzero(self.active)
+        rows = numpy.zeros(len(running), dtype=SERIES)
+        rows["chronon"] = self.chronon
+        rows["sharks"] = sharks[running]
+        rows["fishes"] = fishes[running]
+        rows["empty"] = self.maxX * self.maxY - rows["sharks"] - rows["fishes"]
+        self.series.append((running, rows))
+        self.finish(running[(rows["sharks"] == 0) | (rows["fishes"] == 0)])
+
+    def finish(self, replicas):
+        """
+        Leave replicas out of the chronons to come.
+        """
+        replicas = numpy.asarray(replicas, dtype=numpy.int64)
+        replicas = replicas[self.active[replicas]]
+        self.active[replicas] = False
+        self.ended[replicas] = self.chronon
+
+    def turn(self):
+        """
+        One chronon of the active replicas.
+        """
+        running = numpy.flatnonzero(self.active)
+        if len(running) == 0:
+            return
+        everyone = len(running) == self.replicas
+        if everyone:
+            state = {name: getattr(self, name) for name, dtype in FIELDS}
+        else:
+            state = {name: getattr(self, name)[running] for name, dtype in FIELDS}
+        if len(running) not in self.keys:
+            self.keys[len(running)] = numpy.arange(len(running) * self.maxX * self.maxY, dtype=numpy.uint64).reshape(len(running), self.maxX, self.maxY)
+        self.phases.seeds = self.seeds[running]
+        for phase in range(3):
+            state = self.phases.run(phase, state, self.keys[len(running)], self.chronon)
+        for name, dtype in FIELDS:
+            if everyone:
+                setattr(self, name, state[name])
+            else:
+                getattr(self, name)[running] = state[name]
+        self.chronon += 1
+        self.record()
+
+    def run(self, chronons):
+        """
+        Run until every replica has finished, or for chronons chronons.
+        Return the population series of every replica.
+        """
+        end = self.chronon + chronons
+        while self.chronon < end and self.active.any():
+            self.turn()
+        return self.getSeries()
+
+    def getSeries(self):
+        """
+        Return a list of SERIES arrays, the population of each replica at
+        every chronon it ran, from the populated sea on.
+        """
+        replicas = numpy.concatenate([running for running, rows in self.series])
+        rows = numpy.concatenate([rows for running, rows in self.series])
+        order = numpy.argsort(replicas, kind="stable")
+        return numpy.split(rows[order], numpy.cumsum(numpy.bincount(replicas, minlength=self.replicas))[:-1])
+
+    def close(self):
+        pass
+
+    def __str__(self):
+        return "Replicas: %d Active: %d Sharks: %d Fishes: %d" % (self.replicas, int(self.active.sum()), self.getSharks(), self.getFishes())
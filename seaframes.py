@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:45:12 2026
+
+Frames of the sea streamed to one file, instead of a png per frame.
+A frame is one byte per cell, the index of its color in the palette,
+compressed with zlib.
+
+frames file:
+    header: b"WATORFRM", version, maxX, maxY, palette size (uint32 each),
+            then the palette colors (uint32 each)
+    frames: chronon (int64), length (uint32), compressed cells
+index file, one record per frame:
+    chronon (int64), byte offset of the frame record (int64)
+
+Frames are compressed and written on a worker thread.
+"""
+
+import os
+import queue
+import struct
+import threading
+import zlib
+
+import numpy
+
+FRAMES_MAGIC = b"WATORFRM"
+FRAMES_VERSION = 1
+
+# sea, shark, hunting shark, fish, fleeing fish
+PALETTE = numpy.array(sorted([0x0000ff, 0xFF0000, 0x660000, 0x00ff00, 0xffff00]), dtype=numpy.uint32)
+
+INDEX_RECORD = numpy.dtype([("chronon", "<i8"), ("offset", "<i8")])
+
+class FrameSink(object):
+    """
+    Append frames of a maxX by maxY sea to path, and their offsets to
+    path + ".idx". An existing file of the same size is appended to.
+    """
+    def __init__(self, path, maxX, maxY, queueSize=8, palette=PALETTE):
+        self.path = path
+        self.maxX = maxX
+        self.maxY = maxY
+        self.palette = palette
+        self.error = None
+        header = struct.pack("<8s4I", FRAMES_MAGIC, FRAMES_VERSION, maxX, maxY, len(palette)) + palette.astype("<u4").tobytes()
+        if os.path.exists(path):
+            with open(path, "rb") as framesFH:
+                if framesFH.read(len(header)) != header:
+                    raise ValueError("%s holds frames of another sea" % path)
+            self.framesFH = open(path, "ab")
+        else:
+            self.framesFH = open(path, "wb")
+            self.framesFH.write(header)
+        self.indexFH = open(path + ".idx", "ab")
+        self.queue = queue.Queue(queueSize)
+        self.thread = threading.Thread(target=self.work, name="FrameSink", daemon=True)
+        self.thread.start()
+
+    def write(self, chronon, colors):
+        """
+        Queue the x by y array of colors, from getColorGrid, as the frame
+        of chronon. colors must not be changed afterwards.
+        """
+        self.raiseError()
+        self.queue.put((chronon, colors))
+
+    def work(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                chronon, colors = item
+                cells = numpy.searchsorted(self.palette, colors).astype(numpy.uint8)
+                data = zlib.compress(cells.tobytes(), 1)
+                offset = self.framesFH.tell()
+                self.framesFH.write(struct.pack("<qI", chronon, len(data)) + data)
+                self.indexFH.write(numpy.array([(chronon, offset)], dtype=INDEX_RECORD).tobytes())
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+
+    def raiseError(self):
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        """
+        Write the queued frames, and close the files.
+        """
+        self.queue.put(None)
+        self.thread.join()
+        self.framesFH.close()
+        self.indexFH.close()
+        self.raiseError()
+
+class FrameReader(object):
+    """
+    Read frames written by FrameSink.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as framesFH:
+            magic, version, self.maxX, self.maxY, colors = struct.unpack("<8s4I", framesFH.read(24))
+            if magic != FRAMES_MAGIC or version != FRAMES_VERSION:
+                raise ValueError("%s is not a version %d frames file" % (path, FRAMES_VERSION))
+            self.palette = numpy.frombuffer(framesFH.read(4 * colors), dtype="<u4")
+        index = numpy.fromfile(path + ".idx", dtype=INDEX_RECORD)
+        # the last frame written for a chronon wins, e.g. after a restore
+        self.offsets = dict(zip(index["chronon"].tolist(), index["offset"].tolist()))
+
+    def getChronons(self):
+        return sorted(self.offsets)
+
+    def getFrame(self, chronon):
+        """
+        Return the x by y array of colors of the frame of chronon.
+        """
+        with open(self.path, "rb") as framesFH:
+            framesFH.seek(self.offsets[chronon])
+            _, length = struct.unpack("<qI", framesFH.read(12))
+            cells = numpy.frombuffer(zlib.decompress(framesFH.read(length)), dtype=numpy.uint8)
+        return self.palette[cells].reshape(self.maxX, self.maxY)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:02:17 2026
+
+A journal of the cells of the sea that changed.
+Each entry is the flat index of a cell (x * maxY + y), and the state of
+the cell before and after the change. Consumers pull the entries, which
+empties the journal, once per chronon.
+"""
+
+from array import array
+
+import numpy
+
+# cell states
+EMPTY = 0
+FISH = 1
+SHARK = 2
+
+class SeaJournal(object):
+    """
+    Changed cells, kept in compact arrays until pulled.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.cells = array('q')
+        self.before = array('b')
+        self.after = array('b')
+
+    def record(self, cell, before, after):
+        self.cells.append(cell)
+        self.before.append(before)
+        self.after.append(after)
+
+    def recordArrays(self, cells, before, after):
+        """
+        Record many changes at once from numpy arrays.
+        """
+        self.cells.frombytes(numpy.asarray(cells, dtype=numpy.int64).tobytes())
+        self.before.frombytes(numpy.asarray(before, dtype=numpy.int8).tobytes())
+        self.after.frombytes(numpy.asarray(after, dtype=numpy.int8).tobytes())
+
+    def __len__(self):
+        return len(self.cells)
+
+    def pull(self, net=True):
+        """
+        Return the (cells, before, after) numpy arrays and reset the journal.
+        net = collapse the changes to each cell into one, the state before
+        its first change and after its last change. Cells that end as they
+        started are dropped.
+        """
+        cells = numpy.frombuffer(self.cells, dtype=numpy.int64).copy()
+        before = numpy.frombuffer(self.before, dtype=numpy.int8).copy()
+        after = numpy.frombuffer(self.after, dtype=numpy.int8).copy()
+        self.reset()
+        if net and len(cells) > 0:
+            changed, first = numpy.unique(cells, return_index=True)
+            _, last = numpy.unique(cells[::-1], return_index=True)
+            last = len(cells) - 1 - last
+            before = before[first]
+            after = after[last]
+            keep = before != after
+            cells, before, after = changed[keep], before[keep], after[keep]
+        return cells, before, after
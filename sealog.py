@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:02:49 2026
+
+The verbose log of a run, -v to -vvvv.
+SeaLog holds the records of the chronons in memory and writes them a
+block at a time, rather than a print per line. The format is chosen by
+the extension of the log file:
+
+    .jsonl  a JSON object per record
+    .csv    a row per record, the columns of every record type
+    other   the text lines of the console, as is stdout
+
+Records are of three types:
+
+    chronon   chronon, turn, display, sharks, fishes
+    ages      chronon, kind, age, count
+    creature  chronon, kind, id, parent, x, y, alive, age, spawnIn, starveIn
+"""
+
+import csv
+import json
+import os
+import sys
+
+COLUMNS = ["record", "chronon", "turn", "display", "sharks", "fishes", "kind", "age", "count",
+           "id", "parent", "x", "y", "alive", "spawnIn", "starveIn"]
+
+# fields chronon, kind, id, parent, x, y, alive, age, spawnIn, starveIn
+CREATURE_TEMPLATES = {
+    "jsonl": '{{"record": "creature", "chronon": {0}, "kind": "{1}", "id": {2}, "parent": {3}, "x": {4}, "y": {5}, '
+             '"alive": {6}, "age": {7}, "spawnIn": {8}, "starveIn": {9}}}',
+    "csv": "creature,{0},,,,,{1},{7},,{2},{3},{4},{5},{6},{8},{9}"}
+JSON_BOOLEANS = {True: "true", False: "false"}
+CSV_BOOLEANS = {True: "True", False: "False"}
+
+class SeaLog(object):
+    """
+    Buffered writer of the verbose records to path, or to stdout if path
+    is None. Up to bufferLines lines are held before they are written.
+    """
+    def __init__(self, path=None, bufferLines=4096):
+        self.path = path
+        self.bufferLines = bufferLines
+        self.lines = []
+        if path is None:
+            self.format = "text"
+            self.logFH = sys.stdout
+        else:
+            extension = os.path.splitext(path)[1].lower()
+            self.format = {".jsonl": "jsonl", ".csv": "csv"}.get(extension, "text")
+            self.logFH = open(path, "w", newline="")
+        if self.format == "csv":
+            # the csv writer formats a row into self.write
+            self.writer = csv.writer(self, lineterminator="")
+            self.writer.writerow(COLUMNS)
+
+    def write(self, line):
+        self.lines.append(line)
+        if len(self.lines) >= self.bufferLines:
+            self.flush()
+
+    def record(self, values):
+        if self.format == "jsonl":
+            self.write(json.dumps(values))
+        else:
+            self.writer.writerow([values.get(name, "") for name in COLUMNS])
+
+    def chronon(self, chronon, elapsedTurn, elapsedDisp, aSea):
+        if self.format == "text":
+            self.write("Chronon: %06d Turn: %3.4f Display: %3.4f %s" % (chronon, elapsedTurn, elapsedDisp, aSea))
+        else:
+            self.record({"record": "chronon", "chronon": chronon, "turn": elapsedTurn, "display": elapsedDisp,
+                         "sharks": aSea.getSharks(), "fishes": aSea.getFishes()})
+
+    def ages(self, chronon, kind, histogram):
+        """
+        kind = "shark" or "fish", histogram = dictionary of age: count.
+        """
+        for age in sorted(histogram):
+            if self.format == "text":
+                self.write("Chronon: %06d %s Age: %d Count: %d" % (chronon, kind.capitalize(), age, histogram[age]))
+            else:
+                self.record({"record": "ages", "chronon": chronon, "kind": kind, "age": age, "count": histogram[age]})
+
+    def creatures(self, chronon, creatures):
+        """
+        A record per creature, formatted from a template, the bulk of -vvvv.
+        """
+        if self.format == "text":
+            for creature in creatures:
+                self.write("Chronon: %06d %s" % (chronon, creature))
+            return
+        template = CREATURE_TEMPLATES[self.format].format
+        alive = JSON_BOOLEANS if self.format == "jsonl" else CSV_BOOLEANS
+        for c in creatures:
+            c.settle()
+            self.write(template(chronon, c.KIND, c.creatureID, c.parent, c.pos.x, c.pos.y, alive[c.alive],
+                                c.totalAge, c.spawnAge - c.age, c.starveAge - c.starve))
+
+    def endChronon(self):
+        """
+        The records of a chronon are complete, the console sees them now.
+        """
+        if self.logFH is sys.stdout:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.logFH.write("\n".join(self.lines) + "\n")
+            self.lines = []
+        self.logFH.flush()
+
+    def close(self):
+        self.flush()
+        if self.logFH is not sys.stdout:
+            self.logFH.close()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 09:47:15 2026
+
+Counters and timers of a run, where the time of a chronon goes.
+A sea without metrics (sea.metrics is None) pays one test per counted
+event. Counters are kept per creature kind:
+
+    turns       turns taken
+    lookups     adjacent cell lookups
+    lookaheads  cells looked beyond, by hunting sharks and fleeing fishes
+    births, deaths, eats, starvations
+
+Timers are kept per phase: turn, cleanCreatures, render, save.
+MetricsFile writes the metrics of every chronon to a .csv or .jsonl
+file, or keeps a Prometheus text file (.prom) of the running totals for
+a local scraper, e.g. the node exporter textfile collector.
+ProfileWindow runs cProfile over a window of chronons.
+"""
+
+import cProfile
+import csv
+import json
+import os
+
+KINDS = ("shark", "fish")
+EVENTS = ("turns", "lookups", "lookaheads", "births", "deaths", "eats", "starvations")
+PHASES = ("turn", "cleanCreatures", "render", "save")
+
+class Metrics(object):
+    """
+    Running totals of the counters and timers.
+    """
+    def __init__(self):
+        self.counters = {kind: dict.fromkeys(EVENTS, 0) for kind in KINDS}
+        self.timers = dict.fromkeys(PHASES, 0.0)
+
+    def count(self, kind, event, n=1):
+        self.counters[kind][event] += n
+
+    def addTime(self, phase, seconds):
+        self.timers[phase] += seconds
+
+    def export(self):
+        """
+        Return a flat dictionary of the totals, kind.event and time.phase.
+        """
+        values = {"%s.%s" % (kind, event): self.counters[kind][event] for kind in KINDS for event in EVENTS}
+        values.update(("time." + phase, self.timers[phase]) for phase in PHASES)
+        return values
+
+class MetricsFile(object):
+    """
+    Write metrics to path, the format is chosen by the extension:
+    .csv and .jsonl get a row per chronon of what happened in that
+    chronon, .prom is rewritten with the totals so far.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.format = os.path.splitext(path)[1].lower()
+        if self.format not in (".csv", ".jsonl", ".prom"):
+            raise ValueError("metrics file %s must end in .csv, .jsonl or .prom" % path)
+        self.previous = Metrics().export()
+        self.metricsFH = None
+        if self.format != ".prom":
+            self.metricsFH = open(path, "w", newline="")
+        if self.format == ".csv":
+            self.writer = csv.DictWriter(self.metricsFH, ["chronon", "sharks", "fishes"] + list(self.previous))
+            self.writer.writeheader()
+
+    def write(self, chronon, aSea, metrics):
+        values = metrics.export()
+        if self.format == ".prom":
+            self.writeProm(chronon, aSea, values)
+            return
+        row = {"chronon": chronon, "sharks": aSea.getSharks(), "fishes": aSea.getFishes()}
+        row.update((name, values[name] - self.previous[name]) for name in values)
+        self.previous = values
+        if self.format == ".csv":
+            self.writer.writerow(row)
+        else:
+            self.metricsFH.write(json.dumps(row) + "\n")
+
+    def writeProm(self, chronon, aSea, values):
+        lines = ["# TYPE wator_chronon gauge", "wator_chronon %d" % chronon,
+                 "# TYPE wator_creatures gauge",
+                 'wator_creatures{kind="shark"} %d' % aSea.getSharks(),
+                 'wator_creatures{kind="fish"} %d' % aSea.getFishes()]
+        for event in EVENTS:
+            lines.append("# TYPE wator_%s_total counter" % event)
+            lines.extend('wator_%s_total{kind="%s"} %d' % (event, kind, values["%s.%s" % (kind, event)]) for kind in KINDS)
+        lines.append("# TYPE wator_phase_seconds_total counter")
+        lines.extend('wator_phase_seconds_total{phase="%s"} %f' % (phase, values["time." + phase]) for phase in PHASES)
+        # renamed into place, a scraper never reads half a file
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as promFH:
+            promFH.write("\n".join(lines) + "\n")
+        os.replace(temporary, self.path)
+
+    def close(self):
+        if self.metricsFH is not None:
+            self.metricsFH.close()
+
+class ProfileWindow(object):
+    """
+    cProfile the chronons first to last, both included, and write the
+    statistics to path for pstats or snakeviz.
+    """
+    def __init__(self, first, last, path="wator.prof"):
+        self.first = first
+        self.last = last
+        self.path = path
+        self.profile = None
+        self.done = False
+
+    def before(self, chronon):
+        """
+        Called before the turn that completes chronon.
+        """
+        if self.profile is None and not self.done and self.first <= chronon <= self.last:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def after(self, chronon):
+        """
+        Called once chronon is complete.
+        """
+        if chronon >= self.last:
+            self.close()
+
+    def close(self):
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(self.path)
+            print("Profile of chronons %d - %d written to %s" % (self.first, self.last, self.path))
+            self.profile = None
+            self.done = True
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:31:05 2026
+
+Neighbour tables for the torus.
+Cells are numbered in a flat array, cell (x,y) is index x * maxY + y.
+For a sea size and search pattern the index of every neighbour of every
+cell is worked out once, and shared by the object seas of that size.
+The array engines move by arithmetic on whole grids and need no table.
+"""
+
+# traditional:
+#             (0,+1)
+#     (-1, 0)  Pos.  (+1, 0)
+#             (0,-1)
+TRADITIONAL = ((0,+1),(-1, 0),(+1, 0),(0,-1))
+# new:
+#     (-1,+1) (0,+1) (+1,+1)
+#     (-1, 0)  Pos.  (+1, 0)
+#     (-1,-1) (0,-1) (+1,-1)
+ENHANCED = ((-1,+1),(0,+1),(+1,+1),(-1, 0),(+1, 0),(-1,-1),(0,-1),(+1,-1))
+
+# the fishes and sharks next to a cell are counted in one number,
+# fishes + NEAR_SHARK * sharks, see Sea.getNearCounts
+NEAR_SHARK = 16 # more than the neighbours of a cell
+
+def getOffsets(traditional):
+    if traditional:
+        return TRADITIONAL
+    else:
+        return ENHANCED
+
+class NeighbourTable(object):
+    """
+    Flat neighbour indices of every cell of a maxX by maxY torus.
+    """
+    def __init__(self, maxX, maxY, traditional):
+        self.maxX = maxX
+        self.maxY = maxY
+        self.traditional = traditional
+        self.offsets = getOffsets(traditional)
+        self.coords = [(x, y) for x in range(maxX) for y in range(maxY)]
+        self.adjacent = [tuple(((x + dx) % maxX) * maxY + (y + dy) % maxY for dx, dy in self.offsets)
+                         for x, y in self.coords]
+
+    def index(self, x, y):
+        return x * self.maxY + y
+
+tables = {}
+
+def getNeighbourTable(maxX, maxY, traditional):
+    """
+    Return the NeighbourTable for the sea size and search pattern,
+    building it on first use.
+    """
+    key = (maxX, maxY, bool(traditional))
+    table = tables.get(key)
+    if table is None:
+        table = NeighbourTable(maxX, maxY, traditional)
+        tables[key] = table
+    return table
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:37:08 2026
+
+The array sea split over worker processes.
+A chronon is three phases: sharks eat, sharks spawn or hunt, fishes spawn
+or flee. Every phase is written so that the new state of a cell depends
+only on the old state of the cells within HALO of it, and on random
+numbers drawn from the position of the cell, the chronon and the seed.
+Competing creatures are resolved at their target cell, the claimant with
+the highest random priority wins.
+
+The sea is kept twice in shared memory. Each worker owns a strip of
+rows (x), reads its strip plus HALO rows either side from one copy and
+writes its strip to the other copy, the copies swap after every phase.
+Because nothing depends on how the sea is split, a seed gives the same
+sea whatever the number of workers.
+
+A sea too large for memory is kept in two sets of files mapped with
+numpy.memmap instead, and every strip is computed a tile of rows at a
+time, so only a few tiles need to be in memory at once.
+"""
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy
+
+from seaarray import SPAWN_CHANCE, SeaArray
+from seajournal import EMPTY, FISH, SHARK
+from seaneighbours import getOffsets
+from searandom import cellBits, cellUniforms
+from seasteady import gridHash
+
+HALO = 4 # rows, the reach of the spawn or move phases
+TILE_CELLS = 2**20 # cells per tile of a sea mapped from files
+
+# state of a cell, acted is set for sharks that tried to eat this chronon
+FIELDS = (("cells", numpy.int8), ("age", numpy.int32), ("totalAge", numpy.int32),
+          ("starve", numpy.int32), ("alert", numpy.bool_), ("acted", numpy.bool_))
+
+# random streams of a chronon
+EAT_CHOICE, EAT_PRIORITY, EAT_SPAWN = 0, 1, 2
+SHARK_CHOICE, SHARK_PRIORITY, SHARK_SPAWN = 3, 4, 5
+FISH_CHOICE, FISH_PRIORITY, FISH_SPAWN = 6, 7, 8 # up to STREAMS
+
+class Phases(object):
+    """
+    The phases of a chronon as functions of a block of state arrays.
+    The block wraps around in both directions, cells within HALO of an
+    edge that is not a true edge of the torus come out wrong.
+    Creatures are handled as arrays of flat cell indices into the block.
+    """
+    def __init__(self, maxX, maxY, traditional, sharkSpawn, sharkStarve, fishSpawn, seed):
+        self.sharkSpawn = sharkSpawn
+        self.sharkStarve = sharkStarve
+        self.fishSpawn = fishSpawn
+        self.seed = seed
+        self.search = getOffsets(traditional)
+        self.dx = numpy.array([dx for dx, dy in self.search])
+        self.dy = numpy.array([dy for dx, dy in self.search])
+
+    def around(self, cells, shape):
+        """
+        Return the (n, directions) flat indices of the neighbours of cells.
+        """
+        rows, columns = shape
+        x, y = numpy.divmod(cells, columns)
+        return ((x[:, None] + self.dx) % rows) * columns + (y[:, None] + self.dy) % columns
+
+    def uniforms(self, chronon, stream, keys):
+        return cellUniforms(self.seed, chronon, stream, keys)
+
+    def bits(self, chronon, stream, keys):
+        return cellBits(self.seed, chronon, stream, keys)
+
+    def counts(self, grid):
+        """
+        Return, per cell, the number of neighbours where grid is True.
+        """
+        total = numpy.zeros(grid.shape, dtype=numpy.int8)
+        for dx, dy in self.search:
+            total += numpy.roll(grid, (-dx, -dy), axis=(0, 1))
+        return total.ravel()
+
+    def pick(self, weights, uniforms):
+        """
+        Return a direction per row of weights (n, directions).
+        """
+        total = numpy.cumsum(weights, axis=1)
+        return numpy.argmax(total > uniforms[:, None] * total[:, -1:], axis=1)
+
+    def resolve(self, targets, priority, keys):
+        """
+        Return True for the claims that won their target, the claim with
+        the highest priority (then key) on a target wins.
+        """
+        order = numpy.lexsort((keys, priority, targets))
+        ordered = targets[order]
+        last = numpy.ones(len(order), dtype=bool)
+        last[:-1] = ordered[1:] != ordered[:-1]
+        won = numpy.zeros(len(order), dtype=bool)
+        won[order[last]] = True
+        return won
+
+    def copyState(self, state):
+        return {name: state[name].copy() for name, dtype in FIELDS}
+
+    def clear(self, flat, cells):
+        for name, dtype in FIELDS:
+            flat[name][cells] = 0
+
+    def sharkEat(self, state, keys, chronon):
+        """
+        Sharks age and starve, then a shark next to a fish eats it and may
+        spawn where it was.
+        """
+        new = self.copyState(state)
+        flat = {name: new[name].ravel() for name, dtype in FIELDS}
+        keys = keys.ravel()
+        cells = flat["cells"]
+        flat["acted"][:] = False
+        sharks = numpy.flatnonzero(cells == SHARK)
+        for name in ("age", "totalAge", "starve"):
+            flat[name][sharks] += 1
+        starved = flat["starve"][sharks] > self.sharkStarve
+        self.clear(flat, sharks[starved])
+        sharks = sharks[~starved]
+        flat["alert"][sharks] = False
+
+        near = self.around(sharks, new["cells"].shape)
+        fishNear = cells[near] == FISH
+        hungry = fishNear.any(axis=1)
+        sharks, near, fishNear = sharks[hungry], near[hungry], fishNear[hungry]
+        flat["acted"][sharks] = True
+        direction = self.pick(fishNear, self.uniforms(chronon, EAT_CHOICE, keys[sharks]))
+        targets = near[numpy.arange(len(sharks)), direction]
+        won = self.resolve(targets, self.bits(chronon, EAT_PRIORITY, keys[sharks]), keys[sharks])
+        sharks, targets = sharks[won], targets[won]
+        spawning = (flat["age"][sharks] >= self.sharkSpawn) & (self.uniforms(chronon, EAT_SPAWN, keys[sharks]) > SPAWN_CHANCE)
+
+        for name in ("age", "totalAge", "alert"):
+            flat[name][targets] = flat[name][sharks]
+        cells[targets] = SHARK
+        flat["starve"][targets] = 0
+        flat["acted"][targets] = True
+        # the parent, now on the fish, starts again, its child takes its place
+        flat["age"][targets[spawning]] = 0
+        self.clear(flat, sharks)
+        cells[sharks[spawning]] = SHARK
+        flat["acted"][sharks[spawning]] = True
+        return new
+
+    def spawnOrMove(self, flat, keys, chronon, movers, near, weights, kind, spawnAge, streams):
+        """
+        movers spawn into, or move to, the neighbour in near chosen by weights.
+        """
+        choice, priority, spawn = streams
+        direction = self.pick(weights, self.uniforms(chronon, choice, keys[movers]))
+        targets = near[numpy.arange(len(movers)), direction]
+        spawning = (flat["age"][movers] >= spawnAge) & (self.uniforms(chronon, spawn, keys[movers]) > SPAWN_CHANCE)
+        won = self.resolve(targets, self.bits(chronon, priority, keys[movers]), keys[movers])
+
+        born = won & spawning
+        flat["cells"][targets[born]] = kind
+        flat["age"][movers[born]] = 0
+        moved = won & ~spawning
+        for name, dtype in FIELDS:
+            flat[name][targets[moved]] = flat[name][movers[moved]]
+        self.clear(flat, movers[moved])
+
+    def sharkMove(self, state, keys, chronon):
+        """
+        Sharks that did not try to eat spawn, or hunt, moving towards
+        fishes two spaces away.
+        """
+        new = self.copyState(state)
+        flat = {name: new[name].ravel() for name, dtype in FIELDS}
+        cells = flat["cells"]
+        sharks = numpy.flatnonzero((cells == SHARK) & ~flat["acted"])
+        near = self.around(sharks, new["cells"].shape)
+        free = cells[near] == EMPTY
+        movers = free.any(axis=1)
+        sharks, near, free = sharks[movers], near[movers], free[movers]
+        prey = self.counts(new["cells"] == FISH)[near] * free
+        hunting = prey.any(axis=1)
+        flat["alert"][sharks[hunting]] = True
+        weights = numpy.where(hunting[:, None], prey, free)
+        self.spawnOrMove(flat, keys.ravel(), chronon, sharks, near, weights, SHARK, self.sharkSpawn,
+                         (SHARK_CHOICE, SHARK_PRIORITY, SHARK_SPAWN))
+        return new
+
+    def fishMove(self, state, keys, chronon):
+        """
+        Fishes age, then spawn or flee, moving away from sharks when there
+        is a safe space to move to.
+        """
+        new = self.copyState(state)
+        flat = {name: new[name].ravel() for name, dtype in FIELDS}
+        cells = flat["cells"]
+        fishes = numpy.flatnonzero(cells == FISH)
+        flat["age"][fishes] += 1
+        flat["totalAge"][fishes] += 1
+        flat["alert"][fishes] = False
+
+        near = self.around(fishes, new["cells"].shape)
+        free = cells[near] == EMPTY
+        movers = free.any(axis=1)
+        fishes, near, free = fishes[movers], near[movers], free[movers]
+        doomed = (self.counts(new["cells"] == SHARK) > 0)[near] & free
+        safe = free & ~doomed
+        anySafe = safe.any(axis=1)
+        flat["alert"][fishes[anySafe & doomed.any(axis=1)]] = True
+        weights = numpy.where(anySafe[:, None], safe, free)
+        self.spawnOrMove(flat, keys.ravel(), chronon, fishes, near, weights, FISH, self.fishSpawn,
+                         (FISH_CHOICE, FISH_PRIORITY, FISH_SPAWN))
+        return new
+
+    def run(self, phase, state, keys, chronon):
+        return (self.sharkEat, self.sharkMove, self.fishMove)[phase](state, keys, chronon)
+
+def sharedArrays(names, shape):
+    """
+    Attach to the shared memory blocks names, return the shared memory
+    and the state arrays of each copy.
+    """
+    memory = []
+    copies = []
+    for copyNames in names:
+        arrays = {}
+        for (name, dtype), blockName in zip(FIELDS, copyNames):
+            block = shared_memory.SharedMemory(name=blockName)
+            memory.append(block)
+            arrays[name] = numpy.ndarray(shape, dtype=dtype, buffer=block.buf)
+        copies.append(arrays)
+    return memory, copies
+
+def mappedPath(directory, copy, name):
+    return os.path.join(directory, "sea_%d_%s.bin" % (copy, name))
+
+def mappedArrays(directory, shape, mode="r+"):
+    """
+    Return the state arrays of each copy, mapped from the files in directory.
+    """
+    return [{name: numpy.memmap(mappedPath(directory, copy, name), dtype=dtype, mode=mode, shape=shape)
+             for name, dtype in FIELDS} for copy in range(2)]
+
+def runTiles(phases, phase, source, target, x0, x1, chronon, tileRows):
+    """
+    Run phase on rows x0 to x1 (excluded) of the source copy, writing
+    them to the target copy, tileRows rows at a time. A tile is read
+    with HALO rows either side, in row order, the order of the arrays in
+    memory and on disk.
+    """
+    maxX, maxY = source["cells"].shape
+    columns = numpy.arange(maxY, dtype=numpy.uint64)
+    for t0 in range(x0, x1, tileRows):
+        t1 = min(t0 + tileRows, x1)
+        rows = numpy.arange(t0 - HALO, t1 + HALO) % maxX
+        keys = rows.astype(numpy.uint64)[:, None] * numpy.uint64(maxY) + columns
+        state = {name: source[name][rows] for name, dtype in FIELDS}
+        new = phases.run(phase, state, keys, chronon)
+        for name, dtype in FIELDS:
+            target[name][t0:t1] = new[name][HALO:HALO + t1 - t0]
+
+def work(names, shape, x0, x1, phases, tileRows, connection):
+    """
+    Worker process, owns rows x0 to x1 (excluded).
+    names = the shared memory blocks, or the directory of the mapped files.
+    Receives (phase, chronon, copy to read), or None to stop.
+    """
+    if isinstance(names, str):
+        memory, copies = [], mappedArrays(names, shape)
+    else:
+        memory, copies = sharedArrays(names, shape)
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            phase, chronon, source = message
+            runTiles(phases, phase, copies[source], copies[1 - source], x0, x1, chronon, tileRows)
+            connection.send(True)
+    finally:
+        del copies
+        for block in memory:
+            block.close()
+
+class SeaParallel(SeaArray):
+    """
+    An array sea whose chronons are computed in phases by worker
+    processes, or in this process when workers < 2.
+    With a directory the state is kept in files mapped into memory, and
+    is computed a tile at a time, for seas larger than memory.
+    """
+    def __init__(self, x, y, traditional, sharkSpawn, sharkStarve, fishSpawn, rng, workers=0, seed=None, chronon=0,
+                 directory=None, tileRows=0):
+        """
+        rng = numpy.random.Generator, places the creatures and draws the seed.
+        workers = number of worker processes.
+        seed, chronon = of the random streams, when restoring a sea.
+        directory = where the state files are mapped from, in memory if None.
+        tileRows = rows per tile, 0 for about TILE_CELLS cells per tile.
+        """
+        self.directory = directory
+        self.tileRows = tileRows if tileRows > 0 else max(1, TILE_CELLS // y)
+        SeaArray.__init__(self, x, y, traditional, sharkSpawn, sharkStarve, fishSpawn, rng)
+        if seed is None:
+            seed = int(rng.integers(2**63))
+        self.seed = seed
+        self.chronon = chronon
+        self.phases = Phases(x, y, traditional, sharkSpawn, sharkStarve, fishSpawn, seed)
+        self.keys = None
+        self.workers = min(workers, x)
+        self.processes = []
+        self.memory = []
+        if self.workers > 1:
+            self.startWorkers()
+
+    def allocate(self):
+        if self.directory is None:
+            SeaArray.allocate(self)
+            self.acted = numpy.zeros((self.maxX, self.maxY), dtype=bool)
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self.copies = mappedArrays(self.directory, (self.maxX, self.maxY), "w+")
+        self.current = 0
+        self.pointAt(self.current)
+
+    def tiles(self):
+        """
+        Return the (first row, last row excluded) of every tile.
+        """
+        return [(t0, min(t0 + self.tileRows, self.maxX)) for t0 in range(0, self.maxX, self.tileRows)]
+
+    def countCells(self, kind):
+        if self.directory is None:
+            return int(numpy.count_nonzero(self.cells == kind))
+        return sum(int(numpy.count_nonzero(self.cells[t0:t1] == kind)) for t0, t1 in self.tiles())
+
+    def getStateHash(self):
+        if self.directory is None:
+            return gridHash(self.cells.ravel())
+        stateHash = 0
+        for t0, t1 in self.tiles():
+            stateHash ^= gridHash(self.cells[t0:t1].ravel(), t0 * self.maxY)
+        return stateHash
+
+    def getSharks(self):
+        return self.countCells(SHARK)
+
+    def getFishes(self):
+        return self.countCells(FISH)
+
+    def populate(self, sharks, fishes):
+        """
+        Place sharks and fishes as SeaArray.populate does, or a block of
+        rows at a time when the state is mapped from files. Each block gets
+        its share of the creatures drawn without replacement, so the totals
+        are exact. The blocks are of about TILE_CELLS cells whatever the
+        tileRows, so a seed gives the same mapped sea for any tile size,
+        but not the sea it gives in memory.
+        """
+        if self.directory is None:
+            SeaArray.populate(self, sharks, fishes)
+            return
+        remaining = numpy.array([sharks, fishes, self.maxX * self.maxY - sharks - fishes])
+        rows = max(1, TILE_CELLS // self.maxY)
+        for t0, t1 in [(t0, min(t0 + rows, self.maxX)) for t0 in range(0, self.maxX, rows)]:
+            drawn = self.random.multivariate_hypergeometric(remaining, (t1 - t0) * self.maxY)
+            remaining -= drawn
+            kinds = numpy.repeat(numpy.array([SHARK, FISH, EMPTY], dtype=numpy.int8), drawn)
+            self.random.shuffle(kinds)
+            kinds = kinds.reshape(t1 - t0, self.maxY)
+            age = numpy.zeros(kinds.shape, dtype=numpy.int32)
+            starve = numpy.zeros(kinds.shape, dtype=numpy.int32)
+            age[kinds == SHARK] = self.random.integers(0, self.sharkSpawn, drawn[0])
+            starve[kinds == SHARK] = self.random.integers(0, self.sharkStarve, drawn[0])
+            age[kinds == FISH] = self.random.integers(0, self.fishSpawn, drawn[1])
+            self.cells[t0:t1] = kinds
+            self.age[t0:t1] = age
+            self.totalAge[t0:t1] = age
+            self.starve[t0:t1] = starve
+
+    def startWorkers(self):
+        """
+        Move the state to two shared copies, unless mapped from files, and
+        start a worker per strip.
+        """
+        shape = (self.maxX, self.maxY)
+        self.memory = []
+        if self.directory is None:
+            names = []
+            for copy in range(2):
+                copyNames = []
+                for name, dtype in FIELDS:
+                    block = shared_memory.SharedMemory(create=True, size=max(1, self.maxX * self.maxY * numpy.dtype(dtype).itemsize))
+                    self.memory.append(block)
+                    copyNames.append(block.name)
+                names.append(copyNames)
+            self.copies = []
+            blocks = iter(self.memory)
+            for copy in range(2):
+                self.copies.append({name: numpy.ndarray(shape, dtype=dtype, buffer=next(blocks).buf) for name, dtype in FIELDS})
+            for name, dtype in FIELDS:
+                self.copies[0][name][...] = getattr(self, name)
+            self.current = 0
+            self.pointAt(self.current)
+            tileRows = self.maxX
+        else:
+            # the workers map the same files, and see every write
+            names = self.directory
+            tileRows = self.tileRows
+        self.connections = []
+        edges = numpy.linspace(0, self.maxX, self.workers + 1).astype(int)
+        for x0, x1 in zip(edges[:-1], edges[1:]):
+            ours, theirs = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=work, args=(names, shape, x0, x1, self.phases, tileRows, theirs), daemon=True)
+            process.start()
+            self.processes.append(process)
+            self.connections.append(ours)
+
+    def pointAt(self, copy):
+        for name, dtype in FIELDS:
+            setattr(self, name, self.copies[copy][name])
+
+    def runPhase(self, phase):
+        if self.processes:
+            for connection in self.connections:
+                connection.send((phase, self.chronon, self.current))
+            for connection in self.connections:
+                connection.recv()
+            self.current = 1 - self.current
+            self.pointAt(self.current)
+        elif self.directory is not None:
+            runTiles(self.phases, phase, self.copies[self.current], self.copies[1 - self.current], 0, self.maxX, self.chronon, self.tileRows)
+            self.current = 1 - self.current
+            self.pointAt(self.current)
+        else:
+            if self.keys is None:
+                self.keys = numpy.arange(self.maxX * self.maxY, dtype=numpy.uint64).reshape(self.maxX, self.maxY)
+            state = {name: getattr(self, name) for name, dtype in FIELDS}
+            new = self.phases.run(phase, state, self.keys, self.chronon)
+            for name, dtype in FIELDS:
+                setattr(self, name, new[name])
+
+    def sharkTurn(self):
+        self.runPhase(0)
+        self.runPhase(1)
+
+    def fishTurn(self):
+        self.runPhase(2)
+        self.chronon += 1
+
+    def exportSettings(self):
+        settings = SeaArray.exportSettings(self)
+        settings.update(engine="parallel", seed=self.seed, streamChronon=self.chronon)
+        return settings
+
+    def close(self):
+        """
+        Stop the workers and free the shared memory, or remove the state
+        files, the arrays stay readable until the sea is dropped.
+        """
+        if self.processes:
+            for connection in self.connections:
+                connection.send(None)
+            for process in self.processes:
+                process.join()
+            self.processes = []
+        if self.directory is not None:
+            for copy in range(2):
+                for name, dtype in FIELDS:
+                    path = mappedPath(self.directory, copy, name)
+                    if os.path.exists(path):
+                        os.remove(path)
+        elif self.memory:
+            for name, dtype in FIELDS:
+                setattr(self, name, getattr(self, name).copy())
+            del self.copies
+            for block in self.memory:
+                block.close()
+                block.unlink()
+            self.memory = []
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 10:26:53 2026
+
+The population of the sea chronon by chronon, as fixed size binary
+records in a memory mapped file, a time series without the -v text.
+
+population file:
+    header: b"WATORPOP", version, record size (uint32 each),
+            maxX, maxY, records written (uint64 each), padded to 64 bytes
+    records: chronon, sharks, fishes, empty (int64 each),
+             turn and display seconds (float64 each)
+
+The file is preallocated and grows a chunk of records at a time. The
+count in the header is updated after each record is written, so
+PopulationReader can map the records while the run is still going.
+"""
+
+import os
+
+import numpy
+
+POPULATION_MAGIC = b"WATORPOP"
+POPULATION_VERSION = 1
+
+RECORD = numpy.dtype([("chronon", "<i8"), ("sharks", "<i8"), ("fishes", "<i8"), ("empty", "<i8"),
+                      ("turn", "<f8"), ("display", "<f8")])
+HEADER = numpy.dtype([("magic", "S8"), ("version", "<u4"), ("recordSize", "<u4"),
+                      ("maxX", "<u8"), ("maxY", "<u8"), ("count", "<u8"), ("reserved", "V24")])
+
+def readHeader(path):
+    """
+    Return the header of the population file path, a numpy record.
+    """
+    header = numpy.fromfile(path, dtype=HEADER, count=1)
+    if len(header) == 0 or header["magic"][0] != POPULATION_MAGIC or header["version"][0] != POPULATION_VERSION \
+            or header["recordSize"][0] != RECORD.itemsize:
+        raise ValueError("%s is not a version %d population file" % (path, POPULATION_VERSION))
+    return header[0]
+
+class PopulationRecorder(object):
+    """
+    Append a record per chronon of a maxX by maxY sea to path, chunkRecords
+    records are allocated at a time. An existing file of the same size
+    is appended to. write has the signature of the observe of
+    run_simulation.
+    """
+    def __init__(self, path, maxX, maxY, chunkRecords=65536):
+        self.path = path
+        self.maxX = maxX
+        self.maxY = maxY
+        self.chunkRecords = chunkRecords
+        if os.path.exists(path):
+            header = readHeader(path)
+            if header["maxX"] != maxX or header["maxY"] != maxY:
+                raise ValueError("%s holds the population of another sea" % path)
+            self.count = int(header["count"])
+        else:
+            header = numpy.zeros(1, dtype=HEADER)
+            header[0] = (POPULATION_MAGIC, POPULATION_VERSION, RECORD.itemsize, maxX, maxY, 0, b"")
+            header.tofile(path)
+            self.count = 0
+        self.header = numpy.memmap(path, dtype=HEADER, mode="r+", shape=(1,))
+        self.capacity = self.count
+        self.records = None
+        self.grow()
+
+    def grow(self):
+        """
+        Add a chunk of records to the end of the file and map it again.
+        """
+        if self.records is not None:
+            self.records.flush()
+        self.capacity += self.chunkRecords
+        with open(self.path, "r+b") as populationFH:
+            populationFH.truncate(HEADER.itemsize + self.capacity * RECORD.itemsize)
+        self.records = numpy.memmap(self.path, dtype=RECORD, mode="r+", offset=HEADER.itemsize, shape=(self.capacity,))
+
+    def write(self, chronon, aSea, elapsedTurn, elapsedDisp):
+        if self.count == self.capacity:
+            self.grow()
+        sharks = aSea.getSharks()
+        fishes = aSea.getFishes()
+        self.records[self.count] = (chronon, sharks, fishes, aSea.getMaxX() * aSea.getMaxY() - sharks - fishes,
+                                    elapsedTurn, elapsedDisp)
+        self.count += 1
+        # counted once written, a reader never sees half a record
+        self.header["count"] = self.count
+
+    def close(self):
+        """
+        Write out the records, and cut the file to the records written.
+        """
+        self.records.flush()
+        self.header.flush()
+        self.records = None
+        self.header = None
+        with open(self.path, "r+b") as populationFH:
+            populationFH.truncate(HEADER.itemsize + self.count * RECORD.itemsize)
+
+class PopulationReader(object):
+    """
+    Read records written by PopulationRecorder, also while it is writing.
+    """
+    def __init__(self, path):
+        self.path = path
+        header = readHeader(path)
+        self.maxX = int(header["maxX"])
+        self.maxY = int(header["maxY"])
+
+    def getRecords(self):
+        """
+        Return the records written so far as a read only structured array,
+        mapped from the file rather than copied. After a restore a chronon
+        may appear more than once, the later record is the one that ran on.
+        """
+        count = int(readHeader(self.path)["count"])
+        if count == 0:
+            return numpy.zeros(0, dtype=RECORD)
+        return numpy.memmap(self.path, dtype=RECORD, mode="r", offset=HEADER.itemsize, shape=(count,))
@@ -9,13 +9,18 @@ Created on Wed Nov 15 17:06:04 2017
 class SeaPosition(object):
     """
     Cartesian position (x,y) within the sea.
+    Positions are updated in place as a creature moves.
+    index is the position of the cell in the flat cells of the sea.
     """
+    __slots__ = ("x", "y", "index", "sea")
+
     def __init__(self, x, y, sea):
         """
         Initialize position with given coordinates
         """
         self.x = x
         self.y = y
+        self.index = x * sea.getMaxY() + y
         self.sea = sea
 
     def getX(self):
@@ -27,6 +32,11 @@ class SeaPosition(object):
     def getSeaPosition(self):
         return(self.x, self.y)
 
+    def setSeaPosition(self, x, y):
+        self.x = x
+        self.y = y
+        self.index = x * self.sea.getMaxY() + y
+
     def getAdjacent(self, traditional):
         """
         Returns two arrays of tuples for the positions adjacent to the position.
@@ -42,22 +52,18 @@ class SeaPosition(object):
             (-1,+1) (0,+1) (+1,+1)
             (-1, 0)  Pos.  (+1, 0)
             (-1,-1) (0,-1) (+1,-1)
+        The neighbours are looked up in the sea's NeighbourTable.
         """
         empty = []
         occupied = []
-        search = []
-        if traditional:
-            search = [(0,+1),(-1, 0),(+1, 0),(0,-1)]
-        else:
-            search = [(-1,+1),(0,+1),(+1,+1),(-1, 0),(+1, 0),(-1,-1),(0,-1),(+1,-1)]
-        for s in search:
-            deltaX, deltaY = s[0], s[1]
-            newX = (self.x + deltaX + self.sea.getMaxX()) % self.sea.getMaxX()
-            newY = (self.y + deltaY + self.sea.getMaxY()) % self.sea.getMaxY()
-            if self.sea.isCellEmpty(newX,newY):
-                empty.append((newX, newY))
+        table = self.sea.getNeighbourTable(traditional)
+        cells = self.sea.cells
+        coords = table.coords
+        for i in table.adjacent[self.index]:
+            if cells[i] is None:
+                empty.append(coords[i])
             else:
-                occupied.append((newX, newY))
+                occupied.append(coords[i])
         return(empty,occupied)
 
     def __str__(self):
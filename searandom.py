@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 10:12:36 2026
+
+Random numbers for the sea.
+BatchedRandom stands in for random.Random in the object sea. It draws
+uniforms a block at a time from a seedable NumPy PCG64 generator, so a
+creature's spawn or move costs a list pop rather than a call into the
+generator, or an entropy syscall with random.SystemRandom.
+
+cellBits and cellUniforms are counter based streams, the draw of a cell
+is a hash of the seed, the chronon, the stream and the cell key. Array
+engines get the same draws whatever order, or process, they run in.
+"""
+
+import numpy
+
+class BatchedRandom(object):
+    """
+    The parts of random.Random that the sea uses, served from blocks of
+    blockSize uniforms. seed = None seeds from the operating system.
+    """
+    def __init__(self, seed=None, blockSize=4096):
+        self.generator = numpy.random.Generator(numpy.random.PCG64(seed))
+        self.blockSize = blockSize
+        self.block = []
+
+    def refill(self):
+        self.block = self.generator.random(self.blockSize).tolist()
+
+    def random(self):
+        """
+        Return a float in [0, 1).
+        """
+        try:
+            return self.block.pop()
+        except IndexError:
+            self.refill()
+            return self.block.pop()
+
+    def choice(self, seq):
+        """
+        Return an element of seq, IndexError if seq is empty.
+        """
+        return seq[int(self.random() * len(seq))]
+
+    def randint(self, a, b):
+        """
+        Return an int in [a, b], both included.
+        """
+        return a + int(self.random() * (b - a + 1))
+
+    def getrandbits(self, k):
+        return int.from_bytes(self.generator.bytes((k + 7) // 8), "little") >> (-k % 8)
+
+# streams of a chronon per seed, see cellBits
+STREAMS = 16
+
+def mix64(z):
+    """
+    splitmix64 finalizer of a uint64 array.
+    """
+    z = z + numpy.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> numpy.uint64(30))) * numpy.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> numpy.uint64(27))) * numpy.uint64(0x94D049BB133111EB)
+    return z ^ (z >> numpy.uint64(31))
+
+def cellBits(seed, chronon, stream, keys):
+    """
+    Return 64 random bits per cell, keys = uint64 array of flat cell indices.
+    """
+    counter = numpy.array([seed, chronon * STREAMS + stream], dtype=numpy.uint64)
+    base = mix64(counter[0:1] ^ mix64(counter[1:2]))
+    return mix64(keys ^ base)
+
+def cellUniforms(seed, chronon, stream, keys):
+    """
+    Return a float in [0, 1) per cell, from the 53 high bits of cellBits.
+    """
+    return (cellBits(seed, chronon, stream, keys) >> numpy.uint64(11)).astype(numpy.float64) * 2.0**-53
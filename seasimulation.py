@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 25 09:52:16 2026
+
+Wa-Tor as a library, a run driven from Python rather than the command
+line. A Simulation is a headless sea, new from the settings of wator.py
+or restored from its commits, stepped a chronon at a time:
+
+    simulation = Simulation(160, 90, seed=7, engine="numpy")
+    for stats in simulation.stats(1000):
+        ...
+    cells = simulation.getCells()
+
+The state is read as x by y arrays that cannot be written to. The array
+engines hand out views of their own arrays, no copy is made, and a view
+holds the sea of the chronon it was taken at only until the next step.
+After a step it is not that sea any more, depending on the engine:
+    numpy               the new sea, its arrays are changed in place
+    parallel, workers   a phase of the step, the two shared copies of
+                        the state swap after every phase
+    parallel, none      the old sea, each phase makes new arrays
+so a view is taken again after every step, or taken with copy=True to be
+kept. The object engine has no arrays, its grids are built from the
+creatures once per chronon, and hold their chronon.
+
+    python seasimulation.py
+
+checks the views of every engine against the counts of its sea.
+"""
+
+import os
+import sys
+import time
+
+import numpy
+
+from wator import generateSea, restoreSea, saveSea
+from seadisplay import NullDisplay
+from seajournal import EMPTY, FISH, SHARK
+from searandom import BatchedRandom
+from seasnapshot import SnapshotStore
+
+ENGINES = ("object", "numpy", "parallel")
+
+def readOnly(array):
+    """
+    Return a view of array that cannot be written to.
+    """
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+class Simulation(object):
+    """
+    A headless run of the sea, with the defaults of wator.py.
+    sharks, fishes = initial numbers, 0 for 1/10 and 1/4 of the sea.
+    seed = seed of the random numbers, 0 seeded by the operating system.
+    engine = "object", "numpy" or "parallel", as --engine.
+    workers, directory, tileRows = --workers, --memmap and --tile-rows of
+        the parallel engine.
+    checkpoint = a directory of commits to restore instead, the latest or
+        the committed chronon, the settings of the commit are used.
+    """
+    def __init__(self, x=160, y=90, sharks=0, fishes=0, traditional=False, sharkSpawn=7, sharkStarve=3, fishSpawn=2,
+                 seed=0, engine="object", workers=0, directory=None, tileRows=0, checkpoint=None, chronon=None):
+        random = BatchedRandom(seed if seed != 0 else None)
+        if checkpoint is not None:
+            paths = [os.path.join(checkpoint, name) for name in ("index.json", "save_sea.npz", "save_sea.p")]
+            if not any(os.path.exists(path) for path in paths):
+                raise ValueError("%s holds no commits to restore" % checkpoint)
+            store = SnapshotStore(checkpoint)
+            self.sea, self.view, self.chronon = restoreSea(random, NullDisplay, False, store, chronon,
+                                                           workers, directory, tileRows, *paths[1:],
+                                                           os.path.join(checkpoint, "save_creatures.p"))
+        else:
+            if engine not in ENGINES:
+                raise ValueError("engine must be one of %s" % ", ".join(ENGINES))
+            # smaller, a cell would be its own neighbour, or one neighbour twice
+            if x < 3 or y < 3:
+                raise ValueError("the sea must be at least 3 by 3 cells")
+            if sharkSpawn < 1 or sharkStarve < 1 or fishSpawn < 1:
+                raise ValueError("spawn and starve ages must be greater than zero")
+            if sharks == 0:
+                sharks = int(x * y / 10)
+            if fishes == 0:
+                fishes = int(x * y / 4)
+            if sharks + fishes > x * y:
+                raise ValueError("too many creatures for a %d by %d sea" % (x, y))
+            if engine != "object":
+                random = numpy.random.default_rng(seed if seed != 0 else None)
+            self.sea = generateSea(x, y, sharks, fishes, traditional, sharkSpawn, sharkStarve, fishSpawn, random,
+                                   engine, workers, directory, tileRows)
+            self.view = NullDisplay(self.sea, 5)
+            self.chronon = 0
+        self.columns = None # the grids of the object engine, and the chronon they were built at
+        self.columnsChronon = None
+        self.stores = {} # directory: SnapshotStore, later saves are deltas
+        if checkpoint is not None:
+            # saved back to the checkpoint, the restored run continues
+            self.stores[checkpoint] = store
+
+    def getSea(self):
+        return self.sea
+
+    def getChronon(self):
+        return self.chronon
+
+    def getSharks(self):
+        return self.sea.getSharks()
+
+    def getFishes(self):
+        return self.sea.getFishes()
+
+    def isExtinct(self):
+        """
+        True once the sharks or the fishes have died out, a run ends there.
+        """
+        return self.sea.getSharks() == 0 or self.sea.getFishes() == 0
+
+    def step(self, n=1):
+        """
+        Run up to n chronons, fewer if the sharks or the fishes die out.
+        Return the number of chronons run.
+        """
+        aSea = self.sea
+        done = 0
+        while done < n and aSea.getSharks() != 0 and aSea.getFishes() != 0:
+            aSea.turn()
+            done += 1
+        self.chronon += done
+        return done
+
+    def stats(self, chronons=None):
+        """
+        Step a chronon at a time, for chronons chronons or until the sharks
+        or the fishes die out, and yield a dictionary of the chronon, the
+        sharks, fishes and empty cells after it, and the seconds of its turn.
+        """
+        aSea = self.sea
+        cells = aSea.getMaxX() * aSea.getMaxY()
+        end = None if chronons is None else self.chronon + chronons
+        while (end is None or self.chronon < end) and aSea.getSharks() != 0 and aSea.getFishes() != 0:
+            before = time.time()
+            aSea.turn()
+            elapsedTurn = time.time() - before
+            self.chronon += 1
+            sharks, fishes = aSea.getSharks(), aSea.getFishes()
+            yield {"chronon": self.chronon, "sharks": sharks, "fishes": fishes, "empty": cells - sharks - fishes,
+                   "turn": elapsedTurn}
+
+    def grid(self, name, copy=False):
+        """
+        Return the x by y array of state name, read only. A view of the
+        array of the sea until the next step, a copy that is kept if copy.
+        """
+        if hasattr(self.sea, name) and isinstance(getattr(self.sea, name), numpy.ndarray):
+            if copy:
+                return readOnly(numpy.array(getattr(self.sea, name)))
+            return readOnly(getattr(self.sea, name))
+        # the object engine, built once per chronon from its creatures
+        if self.columnsChronon != self.chronon:
+            columns = self.sea.exportColumns()
+            shape = (self.sea.getMaxX(), self.sea.getMaxY())
+            self.columns = {}
+            for column, dtype in (("type", numpy.int8), ("age", numpy.int32), ("totalAge", numpy.int32), ("starve", numpy.int32)):
+                values = numpy.zeros(shape, dtype=dtype)
+                values[columns["x"], columns["y"]] = columns[column]
+                values.flags.writeable = False
+                self.columns["cells" if column == "type" else column] = values
+            self.columnsChronon = self.chronon
+        return self.columns[name]
+
+    def getCells(self, copy=False):
+        """
+        Return the states of the cells, EMPTY, FISH or SHARK.
+        """
+        return self.grid("cells", copy)
+
+    def getAges(self, copy=False):
+        """
+        Return the ages of the creatures, since birth or their last spawn.
+        """
+        return self.grid("age", copy)
+
+    def getTotalAges(self, copy=False):
+        return self.grid("totalAge", copy)
+
+    def getStarve(self, copy=False):
+        """
+        Return the chronons each shark has gone without eating.
+        """
+        return self.grid("starve", copy)
+
+    def save(self, directory="commits", fullEvery=10):
+        """
+        Commit the sea to directory, as -S does, so that it can be restored
+        with checkpoint=directory or wator.py -R.
+        """
+        if directory not in self.stores:
+            os.makedirs(directory, exist_ok=True)
+            self.stores[directory] = SnapshotStore(directory, fullEvery)
+        saveSea(self.sea, self.view, self.chronon, self.stores[directory])
+
+    def close(self):
+        """
+        Finish the saves, and release the workers and memory of the sea.
+        """
+        for store in self.stores.values():
+            store.close()
+        self.stores = {}
+        self.sea.close()
+
+    def __str__(self):
+        return "Chronon: %06d %s" % (self.chronon, self.sea)
+
+def checkViews(chronons=5):
+    """
+    Step a small sea of every engine, and check that its views are read
+    only, are the arrays of an array engine rather than copies, count the
+    sharks and fishes of the sea, and that copies keep their chronon.
+    Return the number of failed checks.
+    """
+    failed = 0
+    for engine, workers in (("object", 0), ("numpy", 0), ("parallel", 0), ("parallel", 2)):
+        simulation = Simulation(40, 20, 80, 200, seed=3, engine=engine, workers=workers)
+        failures = []
+        for chronon in range(chronons):
+            cells = simulation.getCells()
+            kept = simulation.getCells(copy=True)
+            if cells.flags.writeable or kept.flags.writeable:
+                failures.append("writable view")
+            if engine != "object" and not numpy.shares_memory(cells, simulation.sea.cells):
+                failures.append("view is a copy")
+            if numpy.count_nonzero(cells == SHARK) != simulation.getSharks() or numpy.count_nonzero(cells == FISH) != simulation.getFishes():
+                failures.append("view does not count the sea at chronon %d" % simulation.getChronon())
+            before = kept.copy()
+            if simulation.step() == 0:
+                break
+            if not numpy.array_equal(kept, before):
+                failures.append("copy changed by a step at chronon %d" % simulation.getChronon())
+        simulation.close()
+        failed += len(failures)
+        print("VIEWS -:- %s workers %d: %s" % (engine, workers, "; ".join(sorted(set(failures))) if failures else "ok"))
+    return failed
+
+if __name__ == "__main__":
+    sys.exit(1 if checkViews() else 0)
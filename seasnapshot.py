@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:20:44 2026
+
+Columnar snapshots of the sea.
+A snapshot is a numpy .npz file holding a few header values and one array
+per column, with a row for every creature. A delta holds the header and
+the births, deaths, moves and counter changes since the commit before.
+Files are written to a temporary name, flushed to disk, then renamed over
+the previous file, so a crash never leaves a half written file behind.
+"""
+
+import json
+import os
+import queue
+import threading
+
+import numpy
+
+from seajournal import SHARK
+
+SNAPSHOT_VERSION = 1
+
+# one row per creature, stored as column_<name>
+COLUMNS = ("type", "id", "parent", "x", "y", "traditional", "spawnAge", "starveAge", "totalAge", "age", "starve")
+COLUMN_TYPES = {"type": numpy.int8, "traditional": numpy.bool_}
+
+def columnType(name):
+    return COLUMN_TYPES.get(name, numpy.int64)
+
+def writeSnapshot(path, header, columns):
+    """
+    Write header, a dictionary of values, and columns, a dictionary of
+    numpy arrays, to path.
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as snapshotFH:
+        arrays = {"column_" + name: columns[name] for name in COLUMNS}
+        numpy.savez(snapshotFH, version=SNAPSHOT_VERSION, **header, **arrays)
+        snapshotFH.flush()
+        os.fsync(snapshotFH.fileno())
+    os.replace(temporary, path)
+
+def readSnapshot(path):
+    """
+    Return the header and columns dictionaries of the snapshot in path.
+    """
+    with numpy.load(path) as data:
+        version = int(data["version"])
+        if version != SNAPSHOT_VERSION:
+            raise ValueError("snapshot %s is version %d, expected %d" % (path, version, SNAPSHOT_VERSION))
+        columns = {name: data["column_" + name] for name in COLUMNS}
+        header = {name: data[name].item() for name in data.files if not name.startswith("column_") and name != "version"}
+    return header, columns
+
+# counters a surviving creature is expected to advance by one each chronon,
+# ages for every creature, starve only for sharks, a fish never starves
+COUNTERS = ("totalAge", "age", "starve")
+
+def expectedCounter(columns, name, elapsed):
+    """
+    Return counter name of the rows of columns as expected elapsed
+    chronons later, when nothing but time has happened to them.
+    """
+    if name == "starve":
+        return columns[name] + elapsed * (columns["type"] == SHARK)
+    return columns[name] + elapsed
+
+def creatureKeys(columns, byID):
+    """
+    Return a key per row that follows a creature from commit to commit.
+    byID = the creatures have unique IDs (the object sea), otherwise a
+    creature is known by its position and type (the array sea).
+    """
+    if byID:
+        return columns["id"]
+    return (columns["x"] * 2**28 + columns["y"]) * 4 + columns["type"]
+
+def diffColumns(previous, current, elapsed, byID):
+    """
+    Return a delta, a dictionary of numpy arrays, that turns previous
+    columns into current columns elapsed chronons later:
+    died, the keys of creatures that died.
+    born_<column>, the rows of creatures born.
+    move_key, move_x, move_y, the creatures that moved and where to.
+    <counter>_key, <counter>_value, the counters that are not as
+    expectedCounter has them.
+    """
+    previousKeys = creatureKeys(previous, byID)
+    currentKeys = creatureKeys(current, byID)
+    keys, p, c = numpy.intersect1d(previousKeys, currentKeys, assume_unique=True, return_indices=True)
+    delta = {"died": previousKeys[~numpy.isin(previousKeys, currentKeys, assume_unique=True)]}
+    born = ~numpy.isin(currentKeys, previousKeys, assume_unique=True)
+    for name in COLUMNS:
+        delta["born_" + name] = current[name][born]
+    moved = (previous["x"][p] != current["x"][c]) | (previous["y"][p] != current["y"][c])
+    delta["move_key"] = keys[moved]
+    delta["move_x"] = current["x"][c][moved]
+    delta["move_y"] = current["y"][c][moved]
+    survivors = {name: previous[name][p] for name in ("type",) + COUNTERS}
+    for name in COUNTERS:
+        changed = current[name][c] != expectedCounter(survivors, name, elapsed)
+        delta[name + "_key"] = keys[changed]
+        delta[name + "_value"] = current[name][c][changed]
+    return delta
+
+def applyDelta(previous, delta, elapsed, byID):
+    """
+    Return the columns that diffColumns turned into delta.
+    """
+    keys = creatureKeys(previous, byID)
+    alive = ~numpy.isin(keys, delta["died"], assume_unique=True)
+    columns = {name: previous[name][alive] for name in COLUMNS}
+    keys = keys[alive]
+    order = numpy.argsort(keys)
+    sortedKeys = keys[order]
+    for name in COUNTERS:
+        columns[name] = expectedCounter(columns, name, elapsed)
+        columns[name][order[numpy.searchsorted(sortedKeys, delta[name + "_key"])]] = delta[name + "_value"]
+    rows = order[numpy.searchsorted(sortedKeys, delta["move_key"])]
+    columns["x"][rows] = delta["move_x"]
+    columns["y"][rows] = delta["move_y"]
+    for name in COLUMNS:
+        columns[name] = numpy.concatenate((columns[name], delta["born_" + name]))
+    return columns
+
+def writeDelta(path, header, delta):
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as deltaFH:
+        numpy.savez_compressed(deltaFH, version=SNAPSHOT_VERSION, **header, **{"delta_" + name: delta[name] for name in delta})
+        deltaFH.flush()
+        os.fsync(deltaFH.fileno())
+    os.replace(temporary, path)
+
+def readDelta(path):
+    """
+    Return the header and delta dictionaries of the delta in path.
+    """
+    with numpy.load(path) as data:
+        version = int(data["version"])
+        if version != SNAPSHOT_VERSION:
+            raise ValueError("delta %s is version %d, expected %d" % (path, version, SNAPSHOT_VERSION))
+        delta = {name[len("delta_"):]: data[name] for name in data.files if name.startswith("delta_")}
+        header = {name: data[name].item() for name in data.files if not name.startswith("delta_") and name != "version"}
+    return header, delta
+
+class SnapshotStore(object):
+    """
+    Commits of a run in a directory: a full base snapshot every fullEvery
+    commits, and a delta from the commit before in between.
+    index.json lists every commit, its file and the chronon of its base,
+    so any committed chronon can be restored from its base and at most
+    fullEvery - 1 deltas.
+    """
+    def __init__(self, directory="commits", fullEvery=10):
+        self.directory = directory
+        self.fullEvery = fullEvery
+        self.indexPath = os.path.join(directory, "index.json")
+        self.entries = self.readIndex()
+        self.previous = None # header and columns of the last commit
+        self.sinceBase = 0
+
+    def exists(self):
+        return os.path.exists(self.indexPath)
+
+    def readIndex(self):
+        try:
+            with open(self.indexPath) as indexFH:
+                return json.load(indexFH)
+        except FileNotFoundError:
+            return []
+
+    def writeIndex(self):
+        temporary = self.indexPath + ".tmp"
+        with open(temporary, "w") as indexFH:
+            json.dump(self.entries, indexFH, indent=1)
+            indexFH.flush()
+            os.fsync(indexFH.fileno())
+        os.replace(temporary, self.indexPath)
+
+    def getChronons(self):
+        return [entry["chronon"] for entry in self.entries]
+
+    def clear(self):
+        """
+        Drop the commits of an earlier run, their files and the index.
+        """
+        for entry in self.entries:
+            path = os.path.join(self.directory, entry["file"])
+            if os.path.exists(path):
+                os.remove(path)
+        self.entries = []
+        if os.path.exists(self.indexPath):
+            os.remove(self.indexPath)
+
+    def commit(self, header, columns):
+        """
+        Save the sea described by header and columns, see Sea.exportSettings
+        and Sea.exportColumns. header["chronon"] labels the commit.
+        The first commit of a store that was not restored from starts a
+        new run, the commits of an earlier run are dropped.
+        """
+        if self.previous is None:
+            self.clear()
+        chronon = header["chronon"]
+        if self.previous is not None and self.previous[0]["chronon"] == chronon:
+            return # already committed
+        if self.previous is None or self.sinceBase >= self.fullEvery:
+            name = "base_%06d.npz" % chronon
+            writeSnapshot(os.path.join(self.directory, name), header, columns)
+            base = chronon
+            self.sinceBase = 0
+        else:
+            name = "delta_%06d.npz" % chronon
+            elapsed = chronon - self.previous[0]["chronon"]
+            delta = diffColumns(self.previous[1], columns, elapsed, header["engine"] == "object")
+            writeDelta(os.path.join(self.directory, name), header, delta)
+            base = self.entries[-1]["base"]
+        self.sinceBase += 1
+        self.entries = [entry for entry in self.entries if entry["chronon"] < chronon]
+        self.entries.append({"chronon": chronon, "file": name, "base": base})
+        self.writeIndex()
+        self.previous = (header, columns)
+
+    def restore(self, chronon=None):
+        """
+        Return the header and columns committed at chronon, the latest
+        commit if None. Commits after chronon are dropped from the index,
+        later commits continue from the restored one.
+        """
+        if chronon is None:
+            chronon = self.entries[-1]["chronon"]
+        if chronon not in self.getChronons():
+            raise ValueError("chronon %d was not committed" % chronon)
+        target = [entry for entry in self.entries if entry["chronon"] == chronon][0]
+        chain = [entry for entry in self.entries if entry["base"] == target["base"] and entry["chronon"] <= chronon]
+        header, columns = readSnapshot(os.path.join(self.directory, chain[0]["file"]))
+        for entry in chain[1:]:
+            deltaHeader, delta = readDelta(os.path.join(self.directory, entry["file"]))
+            columns = applyDelta(columns, delta, deltaHeader["chronon"] - header["chronon"], header["engine"] == "object")
+            header = deltaHeader
+        self.entries = [entry for entry in self.entries if entry["chronon"] <= chronon]
+        self.previous = (header, columns)
+        self.sinceBase = len(chain)
+        return header, columns
+
+    def close(self):
+        pass
+
+class SnapshotWriter(object):
+    """
+    Commits to a SnapshotStore on a worker thread, so that the chronon loop
+    only pays for exporting the columns. At most queueSize commits wait
+    for the worker, commit blocks when the queue is full.
+    An error in the worker is raised by the next commit, flush or close.
+    """
+    def __init__(self, store, queueSize=2):
+        self.store = store
+        self.queue = queue.Queue(queueSize)
+        self.error = None
+        self.thread = threading.Thread(target=self.work, name="SnapshotWriter", daemon=True)
+        self.thread.start()
+
+    def work(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                self.store.commit(*item)
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+
+    def raiseError(self):
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def commit(self, header, columns):
+        """
+        Queue the commit, header and columns must not be changed afterwards.
+        """
+        self.raiseError()
+        self.queue.put((header, columns))
+
+    def flush(self):
+        """
+        Wait for the queued commits to be written.
+        """
+        self.queue.join()
+        self.raiseError()
+
+    def close(self):
+        """
+        Write the queued commits and stop the worker.
+        """
+        self.queue.put(None)
+        self.thread.join()
+        self.raiseError()
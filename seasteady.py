@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 14:18:37 2026
+
+Steady states of a run, to end it once nothing more is to be learned.
+
+The state hash is a Zobrist hash of the cells: the XOR of a 64 bit key
+per occupied cell and the state in it, fish or shark. A change of a cell
+XORs out the key of the old state and XORs in the new one, so the object
+sea keeps the hash as it goes. The array seas hash their cells whole.
+
+SteadyState detects either of
+    repeat      the cells are as they were period chronons ago, for a full
+                period, a frozen sea is a repeat of period 1
+    stationary  the shark and fish counts, averaged over the blocks of the
+                last window chronons, are within tolerance of each other,
+                at two block ends in a row
+"""
+
+import collections
+
+import numpy
+
+from seajournal import EMPTY, FISH, SHARK
+from searandom import mix64
+
+def stateKeys(cells, states):
+    """
+    Return the Zobrist keys of the flat cell indices with the given
+    states, uint64 arrays, 0 for the empty cells.
+    """
+    keys = mix64(cells.astype(numpy.uint64) * numpy.uint64(4) + states.astype(numpy.uint64))
+    keys[states == EMPTY] = 0
+    return keys
+
+def keyTable(n):
+    """
+    Return the keys of n cells as a dictionary of state: list of the keys
+    of the cells in that state.
+    """
+    cells = numpy.arange(n, dtype=numpy.uint64)
+    return {state: stateKeys(cells, numpy.full(n, state, dtype=numpy.uint64)).tolist() for state in (EMPTY, FISH, SHARK)}
+
+def gridHash(cells, first=0):
+    """
+    Return the state hash of a flat array of cell states, the first of
+    which is cell first.
+    """
+    occupied = numpy.flatnonzero(cells)
+    if len(occupied) == 0:
+        return 0
+    return int(numpy.bitwise_xor.reduce(stateKeys(occupied + first, cells[occupied])))
+
+class SteadyState(object):
+    """
+    Watch a run for a steady state, observe has the signature of the
+    observe of run_simulation and returns True once one is found.
+    window = chronons of hashes and of counts kept, in blocks blocks.
+    tolerance = largest spread of the block means, a fraction of the mean.
+    """
+    def __init__(self, window=1000, blocks=4, tolerance=0.05):
+        self.block = max(1, window // blocks)
+        self.blocks = blocks
+        self.window = self.block * blocks
+        self.tolerance = tolerance
+        self.hashes = collections.deque()
+        self.seen = {} # hash: last chronon within the window
+        self.period = 0
+        self.repeats = 0
+        self.counts = collections.deque(maxlen=self.window)
+        self.passes = 0
+        self.kind = None # "repeat" or "stationary", once detected
+        self.detected = None # what was detected, to report
+
+    def observe(self, chronon, aSea, elapsedTurn, elapsedDisp):
+        sharks, fishes = aSea.getSharks(), aSea.getFishes()
+        if self.repeat(chronon, aSea.getStateHash()) or self.stationary(chronon, sharks, fishes):
+            print("STEADY -:- Chronon: %06d %s" % (chronon, self.detected))
+            return True
+        return False
+
+    def repeat(self, chronon, stateHash):
+        """
+        Note the hash of chronon, return True once a period has repeated.
+        """
+        if self.period and self.hashes[-self.period] == stateHash:
+            self.repeats += 1
+        else:
+            last = self.seen.get(stateHash)
+            self.period = chronon - last if last is not None else 0
+            self.repeats = 1 if last is not None else 0
+        self.hashes.append(stateHash)
+        self.seen[stateHash] = chronon
+        if len(self.hashes) > self.window:
+            old = self.hashes.popleft()
+            if self.seen.get(old) == chronon - self.window:
+                del self.seen[old]
+        if self.period and self.repeats >= max(self.period, 2):
+            self.kind = "repeat"
+            self.detected = "exact repeat of the sea, period %d chronons since chronon %d" % (self.period, chronon - self.repeats - self.period + 1)
+            return True
+        return False
+
+    def stationary(self, chronon, sharks, fishes):
+        """
+        Note the counts of chronon, return True once they are stationary.
+        """
+        self.counts.append((sharks, fishes))
+        if len(self.counts) < self.window or chronon % self.block != 0:
+            return False
+        means = numpy.array(self.counts, dtype=numpy.float64).reshape(self.blocks, self.block, 2).mean(axis=1)
+        overall = means.mean(axis=0)
+        spread = means.max(axis=0) - means.min(axis=0)
+        if numpy.all(overall > 0) and numpy.all(spread <= self.tolerance * overall):
+            self.passes += 1
+        else:
+            self.passes = 0
+        if self.passes >= 2:
+            self.kind = "stationary"
+            self.detected = "stationary populations over chronons %d - %d, sharks %.1f fishes %.1f, block means within %.1f%%" % (
+                chronon - self.window - self.block + 1, chronon, overall[0], overall[1], 100 * self.tolerance)
+            return True
+        return False
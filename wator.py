@@ -14,59 +14,185 @@ All Y: {0, 1, ..., maxY}
 """
 
 import argparse
+import functools
+import os
 import time
 import pickle
-
-from sea import *
-from seadisplay import *
+import numpy
+
+from sea import Sea
+from seacreature import Shark, Fish
+from searandom import BatchedRandom
+from seadisplay import SeaDisplay, NullDisplay, DetachedDisplay
+from seasnapshot import SnapshotStore, SnapshotWriter, readSnapshot
+from seaframes import FrameSink
+from seametrics import MetricsFile, ProfileWindow
+from sealog import SeaLog
+from seapopulation import PopulationRecorder
+from seasteady import SteadyState
 
 xPixels = 1366
 yPixels = 768
 
 def wator():
-    import random
-    
     args = command_line()
 
-    # set the RNG
-    if args.seed != 0:
-        random.seed(args.seed)
-    else:
-        random = random.SystemRandom()
+    # set the RNG, blocks of numbers from a seedable generator, seeded by the
+    # operating system when --seed is 0
+    random = BatchedRandom(args.seed if args.seed != 0 else None)
         
     # check --Commit > 0
     if args.Save:
         if args.Commit < 1:
             print("--Commit must be greater than zero")
             exit(2)
+    # a headless run never opens a window
+    if args.headless:
+        displayClass = NullDisplay
+    elif args.display_process:
+        # the renderer keeps --framerate, the simulation runs on without waiting
+        displayClass = functools.partial(DetachedDisplay, framerate=args.framerate)
+        args.framerate = 0.0
+    else:
+        displayClass = SeaDisplay
+
+    # commits, full snapshots every --full-every commits, deltas in between
+    store = SnapshotStore("commits", args.full_every)
+
     # restore, or start new
     chronon = 0
     if args.Restore:
-        [aSea, aSeaView, chronon] = restoreSea(random)
+        try:
+            [aSea, aSeaView, chronon] = restoreSea(random, displayClass, args.incremental, store, args.restore_chronon, args.workers, args.memmap, args.tile_rows)
+        except FileNotFoundError as A:
+            print("Restore file", A.filename, "not found")
+            exit(3)
+        except Exception as A:
+            print("Restore Failure A:", repr(A))
+            exit(3)
         args.Save = True # if restored, implies that commits need to continue.
     else:
-        aSea = generateSea(args.x, args.y, args.sharks, args.fishes, args.traditional, args.sharkspawn, args.sharkstarve, args.fishspawn, random)
-        aSeaView = SeaDisplay(aSea,args.cellsize)
+        if args.engine != "object":
+            random = numpy.random.default_rng(args.seed if args.seed != 0 else None)
+        aSea = generateSea(args.x, args.y, args.sharks, args.fishes, args.traditional, args.sharkspawn, args.sharkstarve, args.fishspawn, random, args.engine, args.workers, args.memmap, args.tile_rows)
+        aSeaView = displayClass(aSea,args.cellsize,0,args.incremental)
 
         
+    # commit on a background writer, unless --commit-queue 0
+    if args.Save and args.commit_queue > 0:
+        store = SnapshotWriter(store, args.commit_queue)
+
+    # stream frames to one file instead of a png per frame
+    frames = None
+    if args.Save and args.frame_format == "stream":
+        frames = FrameSink("images/wator.frames", aSea.getMaxX(), aSea.getMaxY())
+
+    # called after every chronon, to count and time its phases into --metrics,
+    # and record the population into --population
+    observers = []
+    if args.metrics:
+        try:
+            metricsFile = MetricsFile(args.metrics)
+        except (ValueError, OSError) as M:
+            print("Metrics Failure M:", M)
+            exit(2)
+        aSea.enableMetrics()
+        observers.append(lambda tick, aSea, elapsedTurn, elapsedDisp: metricsFile.write(tick, aSea, aSea.metrics))
+    if args.population:
+        try:
+            population = PopulationRecorder(args.population, aSea.getMaxX(), aSea.getMaxY())
+        except (ValueError, OSError) as P:
+            print("Population Failure P:", P)
+            exit(2)
+        observers.append(population.write)
+    # end the run on an exact repeat or stationary populations
+    if args.stop_on_steady_state:
+        observers.append(SteadyState(args.steady_window, 4, args.steady_tolerance).observe)
+    observe = None
+    if len(observers) == 1:
+        observe = observers[0]
+    elif observers:
+        def observe(tick, aSea, elapsedTurn, elapsedDisp):
+            stop = False
+            for observer in observers:
+                stop = observer(tick, aSea, elapsedTurn, elapsedDisp) or stop
+            return stop
+
+    profile = None
+    if args.profile:
+        profile = ProfileWindow(args.profile[0], args.profile[1], args.profile_output)
+
+    # verbose records to --log, or the console
+    log = None
+    if args.verbose > 0 and args.log:
+        try:
+            log = SeaLog(args.log)
+        except OSError as L:
+            print("Log Failure L:", L)
+            exit(2)
+
     # run the simulation
-    run_simulation(aSea, aSeaView, args.chronons, args.Save, args.Commit, args.framerate, chronon, args.verbose)
+    run_simulation(aSea, aSeaView, args.chronons, args.Save, args.Commit, args.framerate, chronon, args.verbose, args.render_every, store, frames, observe, profile, log)
+    aSea.close()
+    if args.metrics:
+        metricsFile.close()
+    if args.population:
+        population.close()
+
+def engineClass(engine):
+    """
+    Return the sea class of an array engine, "numpy" or "parallel".
+    The array engines are imported when used, an object run never loads them.
+    """
+    if engine == "numpy":
+        from seaarray import SeaArray
+        return SeaArray
+    from seaparallel import SeaParallel
+    return SeaParallel
 
-def restoreSea(random,save_s="commits/save_sea.p",save_c="commits/save_creatures.p"):
+def restoreSea(random,displayClass=SeaDisplay,incremental=False,store=None,chronon=None,workers=0,directory=None,tileRows=0,save="commits/save_sea.npz",save_s="commits/save_sea.p",save_c="commits/save_creatures.p"):
     """
-    Restore from the file.
+    Restore from the commits in store, or from a single snapshot file, or
+    from the older pickle files, whichever is found first.
+    displayClass = SeaDisplay, or NullDisplay for a headless run.
+    incremental = the display redraws only the cells that changed.
+    store = SnapshotStore of the commits.
+    chronon = committed chronon to restore, the latest if None.
+    Raise ValueError for a chronon that was not committed, and the error
+    of reading the files otherwise, e.g. FileNotFoundError.
     """
-    nextid = 0
-    try:
-        [x, y, lastid, fileNumber, cellsize, chronon] = pickle.load(open(save_s, "rb" ))
-        theSea = Sea(x, y, random)
-        theDisplay = SeaDisplay(theSea, cellsize, fileNumber)
-        nextid = lastid
-    except FileNotFoundError:
-        print("Restore file", save_s, "not found")
-        exit(3)
-    except Exception as A:
-        print("Restore Failure A:", repr(A))
+    if store is None:
+        store = SnapshotStore()
+    if store.exists():
+        header, columns = store.restore(chronon)
+    elif os.path.exists(save):
+        header, columns = readSnapshot(save)
+    else:
+        return restoreSeaPickle(random, displayClass, incremental, save_s, save_c)
+
+    if header["engine"] == "numpy":
+        rng = numpy.random.default_rng(random.getrandbits(64))
+        theSea = engineClass("numpy")(header["maxX"], header["maxY"], header["traditional"], header["sharkSpawn"], header["sharkStarve"], header["fishSpawn"], rng)
+    elif header["engine"] == "parallel":
+        rng = numpy.random.default_rng(random.getrandbits(64))
+        theSea = engineClass("parallel")(header["maxX"], header["maxY"], header["traditional"], header["sharkSpawn"], header["sharkStarve"], header["fishSpawn"], rng,
+                             workers, header["seed"], header["streamChronon"], directory, tileRows)
+    else:
+        theSea = Sea(header["maxX"], header["maxY"], random)
+    theSea.restoreColumns(columns, header.get("nextID"))
+    theDisplay = displayClass(theSea, header["cellsize"], header["fileNumber"], incremental)
+
+    return [theSea, theDisplay, header["chronon"]]
+
+def restoreSeaPickle(random,displayClass=SeaDisplay,incremental=False,save_s="commits/save_sea.p",save_c="commits/save_creatures.p"):
+    """
+    Restore from the pickle files of earlier versions.
+    """
+    with open(save_s, "rb") as pickleFH:
+        [x, y, lastid, fileNumber, cellsize, chronon] = pickle.load(pickleFH)
+    theSea = Sea(x, y, random)
+    theDisplay = displayClass(theSea, cellsize, fileNumber, incremental)
+    nextid = lastid
 
     # using a generator, so that creatures can be iterated
     try:
@@ -79,8 +205,7 @@ def restoreSea(random,save_s="commits/save_sea.p",save_c="commits/save_creatures
                 c.setCreatureID(ID)
                 c.setNextID(nextid)
     except FileNotFoundError:
-        print("Restore file", save_c, "not found")
-        exit(3)
+        raise
     except Exception as B:
         print("Restore Failure B:", repr(B))
 
@@ -91,27 +216,21 @@ def readCreatures(pickleFile):
             with open(pickleFile, "rb" ) as pickleFH:
                 while True:
                     yield pickle.load(pickleFH)
-        except FileNotFoundError:
-            print("Restore file save_creatures.p not found")
-            exit(3)
         except EOFError:
             pass
         
-def saveSea(saveSea, saveDisplay, chronon,save_s="commits/save_sea.p",save_c="commits/save_creatures.p"):
+def saveSea(saveSea, saveDisplay, chronon, store):
     """
-    Save sea and creatures for later restore.
+    Save sea and creatures for later restore, as a commit to store, a
+    SnapshotStore or SnapshotWriter.
     """
-    seaFH  = open(save_s, "wb")
-    pickle.dump(saveSea.exportSea() + [saveSea.creatures[0].getNextID()] + saveDisplay.exportDisplay() + [chronon], seaFH)
-    seaFH.close()
-    
-    creatureFH = open(save_c, "wb")
-    for c in saveSea.creatures:
-        pickle.dump(c.exportCreature(), creatureFH)
-    creatureFH.close()    
+    header = saveSea.exportSettings()
+    header["fileNumber"], header["cellsize"] = saveDisplay.exportDisplay()
+    header["chronon"] = chronon
+    store.commit(header, saveSea.exportColumns())
 
         
-def generateSea(x,y,s,f,traditional,sharkspawn,sharkstarve,fishspawn, random):
+def generateSea(x,y,s,f,traditional,sharkspawn,sharkstarve,fishspawn, random, engine="object", workers=0, directory=None, tileRows=0):
     """
     x =  width of the sea, y the height of the sea - longitude and latitude.
     s = number of sharks, f the number of fishes - all creaturs (so far).
@@ -121,6 +240,12 @@ def generateSea(x,y,s,f,traditional,sharkspawn,sharkstarve,fishspawn, random):
     sharkspawn = age at which a shark breeds.
     sharkstarve = age at which a shark dies if it has not eaten.
     fishspawn = age at which a fish spawns.
+    random = random number generator, a numpy.random.Generator for the array engines.
+    engine = "object" for a Sea of SeaCreatures, "numpy" for a SeaArray,
+        "parallel" for a SeaParallel.
+    workers = number of worker processes of the parallel engine.
+    directory = the parallel engine keeps its state in files mapped from
+        here, tileRows rows at a time, in memory if None.
     """
 
     # the number of sharks and fishes cannot be greater than the
@@ -144,6 +269,15 @@ def generateSea(x,y,s,f,traditional,sharkspawn,sharkstarve,fishspawn, random):
         print("Fish spawn age must be greater than zero.")
         quit(4)
 
+    if engine == "numpy":
+        aSea = engineClass("numpy")(x, y, traditional, sharkspawn, sharkstarve, fishspawn, random)
+        aSea.populate(s, f)
+        return aSea
+    if engine == "parallel":
+        aSea = engineClass("parallel")(x, y, traditional, sharkspawn, sharkstarve, fishspawn, random, workers, directory=directory, tileRows=tileRows)
+        aSea.populate(s, f)
+        return aSea
+
     aSea = Sea(x,y,random)
 
     defaultParent = 0
@@ -195,6 +329,51 @@ def command_line():
     parser.add_argument("--framerate", type=float,
                         help="minimum time between frames, expressed in fractions of seconds e.g. 1, 2, 1.0, 2.0, 0.5. default is 0.0 - no waiting",
                         default=0.0)
+    parser.add_argument("--engine", choices=["object", "numpy", "parallel"],
+                        help="simulation engine, object - a creature object per fish and shark, numpy - whole sea arrays, parallel - whole sea arrays split over --workers processes. default is object",
+                        default="object")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a display, nothing is drawn or saved as images",
+                        default=False)
+    parser.add_argument("--display-process", action="store_true",
+                        help="draw the sea in a process of its own at --framerate, frames the simulation outruns are dropped",
+                        default=False)
+    parser.add_argument("--incremental", action="store_true",
+                        help="redraw only the cells that changed since the last frame",
+                        default=False)
+    parser.add_argument("--log",
+                        help="write the -v records to this file instead of the console, .jsonl, .csv, or any other name for the console text",
+                        default=None)
+    parser.add_argument("--memmap", metavar="DIRECTORY",
+                        help="keep the sea of --engine parallel in files mapped from DIRECTORY, computed a tile at a time, for seas larger than memory. A --seed places the creatures differently than in memory, the same for any --tile-rows",
+                        default=None)
+    parser.add_argument("--metrics",
+                        help="write counters and phase timings of every chronon to this file, .csv, .jsonl, or .prom for a Prometheus text file of the totals",
+                        default=None)
+    parser.add_argument("--population",
+                        help="record the sharks, fishes, empty cells and timings of every chronon to this binary file, see seapopulation.py",
+                        default=None)
+    parser.add_argument("--profile", type=int, nargs=2, metavar=("FIRST", "LAST"),
+                        help="run cProfile over chronons FIRST to LAST",
+                        default=None)
+    parser.add_argument("--profile-output",
+                        help="file the --profile statistics are written to, default wator.prof",
+                        default="wator.prof")
+    parser.add_argument("--render-every", type=int,
+                        help="number of chronons between drawing (and saving) the sea, default 1",
+                        default=1)
+    parser.add_argument("--frame-format", choices=["png", "stream"],
+                        help="how frames are saved with --Save, png - images/wator_NNNNNN.png per frame, stream - all frames in images/wator.frames. default is png",
+                        default="png")
+    parser.add_argument("--full-every", type=int,
+                        help="number of commits between full snapshots, deltas are saved in between, default 10",
+                        default=10)
+    parser.add_argument("--commit-queue", type=int,
+                        help="number of commits that can wait for the background writer, 0 commits on the simulation thread, default 2",
+                        default=2)
+    parser.add_argument("--restore-chronon", type=int,
+                        help="committed chronon to restore with --Restore, default the latest",
+                        default=None)
     group = parser.add_mutually_exclusive_group()
     group.add_argument("-R", "--Restore", action="store_true",
                         help="restore a saved sea",
@@ -214,12 +393,27 @@ def command_line():
     parser.add_argument("--sharkstarve", type=int,
                         help="chronons that a shark can live without eating, default 3, must be greater than 0",
                         default=3)
+    parser.add_argument("--tile-rows", type=int,
+                        help="rows per tile of --memmap, default 0 - about a million cells per tile",
+                        default=0)
+    parser.add_argument("--stop-on-steady-state", action="store_true",
+                        help="end the run when the sea repeats exactly, or the shark and fish counts are stationary",
+                        default=False)
+    parser.add_argument("--steady-window", type=int,
+                        help="chronons the steady state is looked for over, default 1000",
+                        default=1000)
+    parser.add_argument("--steady-tolerance", type=float,
+                        help="largest spread of the mean counts of the quarters of --steady-window, as a fraction of the mean, default 0.05",
+                        default=0.05)
     parser.add_argument("-t", "--traditional", action="store_true",
                         help="traditional search pattern is vertical and horizontoal. Default is traditional enhanced with diagonal searches.",
                         default=False)
     parser.add_argument("-v", "--verbose", action="count",
                         help="-v chronon summary, -vv shark summary per chronon, -vvv fish summary per chronon -vvvv individual creature data per chronon",
                         default=False)
+    parser.add_argument("-w", "--workers", type=int,
+                        help="number of worker processes of --engine parallel, 0 or 1 computes in this process. default is 0",
+                        default=0)
     parser.add_argument("-x", type=int,
                         help="number of horizontal cells, default 160, range 20 - calculated max based on --cellsize",
                         default=160)
@@ -236,13 +430,19 @@ def command_line():
 
     # check the dimensions of the sea, 320x160 is the largest allowed.
     # calculate maxX = xPixels // args.cellsize - ((xPixels//args.cellsize)%2)
+    # a headless sea is not drawn, and can be as large as memory, or with
+    # --memmap the disk, allows.
     maxX = xPixels // args.cellsize - ((xPixels//args.cellsize)%2)
+    if args.headless:
+        maxX = 2**31 - 1
     if args.x < 20 or args.x > maxX:
         print("x must be in range 20 - %d" % maxX)
         quit(1)
 
     # calculate maxY = yPixels // args.cellsize - ((yPixels//args.cellsize)%2)
     maxY = yPixels // args.cellsize - ((yPixels//args.cellsize)%2)
+    if args.headless:
+        maxY = 2**31 - 1
     if args.y < 10 or args.y > maxY:
         print("y must be in range 10 - %d" % maxY)
         quit(2)
@@ -261,6 +461,56 @@ def command_line():
         print("Warning: verbosity can only be set to -vvvv, or --verbose --verbose --verbose --verbose")
         args.verbose = 4
     
+    # check --full-every > 0
+    if args.full_every < 1:
+        print("--full-every must be greater than zero")
+        quit(1)
+
+    # check --commit-queue >= 0
+    if args.commit_queue < 0:
+        print("--commit-queue must not be negative")
+        quit(1)
+
+    # check --profile FIRST <= LAST
+    if args.profile and (args.profile[0] < 1 or args.profile[0] > args.profile[1]):
+        print("--profile FIRST must be at least 1, and no more than LAST")
+        quit(1)
+
+    # check --display-process has a display
+    if args.display_process and args.headless:
+        print("--display-process needs a display, not --headless")
+        quit(1)
+
+    # check --render-every > 0
+    if args.render_every < 1:
+        print("--render-every must be greater than zero")
+        quit(1)
+
+    # check --memmap, the state files of a sea too large for memory
+    if args.memmap and args.engine != "parallel" and not args.Restore:
+        print("--memmap needs --engine parallel")
+        quit(1)
+    if args.tile_rows < 0:
+        print("--tile-rows must not be negative")
+        quit(1)
+    if args.steady_window < 4:
+        print("--steady-window must be at least 4")
+        quit(1)
+    if args.steady_tolerance < 0:
+        print("--steady-tolerance must not be negative")
+        quit(1)
+
+    # check --workers >= 0
+    if args.workers < 0:
+        print("--workers must not be negative")
+        quit(1)
+
+    # the array engines have no creature objects to list.
+    if args.engine != "object":
+        if args.verbose > 3:
+            print("Warning: --engine %s has no individual creature data, verbosity set to -vvv" % args.engine)
+            args.verbose = 3
+
     # calculate the size of the sea
     total_cells = args.x * args.y
     
@@ -276,7 +526,7 @@ def command_line():
     return args    
     
 
-def run_simulation(aSea, seaView, chronons, save, commit, framerate, firstChronon=0, verbosity=0):
+def run_simulation(aSea, seaView, chronons, save, commit, framerate, firstChronon=0, verbosity=0, renderEvery=1, store=None, frames=None, observe=None, profile=None, log=None):
     """
     aSea = sea containing all creatures.
     chronons = maximum number of chronons to run.
@@ -285,7 +535,19 @@ def run_simulation(aSea, seaView, chronons, save, commit, framerate, firstChrono
     framerate = time between frames in seconds (fractions).
     firstChronon = start point.
     verbosity = amount/type of log messages.
+    renderEvery = number of chronons between showing the sea.
+    store = SnapshotStore or SnapshotWriter to commit to, commits/ if None.
+    frames = FrameSink that saved frames are streamed to, png files if None.
+    observe = called as observe(chronon, aSea, elapsedTurn, elapsedDisp)
+              after every chronon, the run ends if it returns True.
+    profile = ProfileWindow of the chronons to profile.
+    log = SeaLog the verbose records are written to, stdout if None.
+    The turn, render and save phases are timed into aSea.metrics, if enabled.
     """
+    if save and store is None:
+        store = SnapshotStore()
+    if verbosity > 0 and log is None:
+        log = SeaLog()
 
     # print first message
     print("BEGIN -:- maxX: %d maxY: %d Positions: %d Cell Size: %d" % (aSea.getMaxX(), aSea.getMaxY(), aSea.getMaxX() * aSea.getMaxY(), seaView.getCellSize()))
@@ -294,53 +556,72 @@ def run_simulation(aSea, seaView, chronons, save, commit, framerate, firstChrono
     tick = firstChronon
     simulating  = True
     while simulating and tick < firstChronon+chronons and aSea.getSharks() != 0 and aSea.getFishes() != 0:  # in range(200):
+        if profile is not None:
+            profile.before(tick + 1)
         before = time.time()
-        theCreatures = aSea.creatures.copy()
-        for c in theCreatures:
-            c.turn()
-        aSea.cleanCreatures()
+        aSea.turn()
         elapsedTurn = time.time() - before
-        before = time.time()
-        wait_time = framerate - elapsedTurn
-        if wait_time > 0:
-            time.sleep(wait_time)
-        simulating = seaView.showImage(aSea,save)
-        elapsedDisp = time.time() - before
+        elapsedDisp = 0.0
+        if tick % renderEvery == 0:
+            before = time.time()
+            wait_time = framerate - elapsedTurn
+            if wait_time > 0:
+                time.sleep(wait_time)
+            colors = None
+            if save and frames is not None:
+                colors = aSea.getColorGrid()
+                frames.write(tick + 1, colors)
+            simulating = seaView.showImage(aSea, save and frames is None, colors)
+            elapsedDisp = time.time() - before
+        tick += 1
+        elapsedSave = 0.0
         if save:
             if tick % commit == 0:
-                saveSea(aSea, seaView, tick)
-        tick += 1
+                before = time.time()
+                try:
+                    saveSea(aSea, seaView, tick, store)
+                except Exception as C:
+                    print("Commit Failure C:", repr(C))
+                elapsedSave = time.time() - before
+        if aSea.metrics is not None:
+            aSea.metrics.addTime("turn", elapsedTurn)
+            aSea.metrics.addTime("render", elapsedDisp)
+            aSea.metrics.addTime("save", elapsedSave)
+        if profile is not None:
+            profile.after(tick)
+        if observe is not None and observe(tick, aSea, elapsedTurn, elapsedDisp):
+            simulating = False
         if verbosity > 0:
-            print("Chronon: %06d Turn: %3.4f Display: %3.4f %s"
-                  % (tick,elapsedTurn,elapsedDisp,aSea) )
+            log.chronon(tick, elapsedTurn, elapsedDisp, aSea)
         if verbosity > 1:
-            verbalSharks = {}
-            for creature in aSea.creatures:
-                if type(creature) is Shark:
-                    try:
-                        verbalSharks[creature.getAge()] += 1
-                    except:
-                        verbalSharks[creature.getAge()] = 1
-            for summary in sorted(verbalSharks):                        
-                print("Chronon: %06d Shark Age: %d Count: %d" % (tick, summary, verbalSharks[summary]))
+            log.ages(tick, "shark", aSea.getSharkAges())
         if verbosity > 2:
-            verbalFishes = {}
-            for creature in aSea.creatures:
-                if type(creature) is Fish:
-                    try:
-                        verbalFishes[creature.getAge()] += 1
-                    except:
-                        verbalFishes[creature.getAge()] = 1
-            for summary in sorted(verbalFishes):                        
-                print("Chronon: %06d Fish Age: %d Count: %d" % (tick, summary, verbalFishes[summary]))
+            log.ages(tick, "fish", aSea.getFishAges())
         if verbosity > 3:
-            for creature in aSea.creatures:
-                print("Chronon: %06d %s" % (tick, creature))
+            log.creatures(tick, aSea.creatures)
+        if verbosity > 0:
+            log.endChronon()
 
     endTime = time.time()
+    if log is not None:
+        log.close()
+    if profile is not None:
+        profile.close()
     # final commit
     if save:
-        saveSea(aSea, seaView, tick)
+        try:
+            saveSea(aSea, seaView, tick, store)
+        except Exception as D:
+            print("Commit Failure D:", repr(D))
+        try:
+            store.close()
+        except Exception as E:
+            print("Commit Failure E:", repr(E))
+    if frames is not None:
+        try:
+            frames.close()
+        except Exception as F:
+            print("Frame Failure F:", repr(F))
     
     # print final message
     hours, remainingSeconds = divmod(endTime-startTime, 3600)
@@ -351,4 +632,5 @@ def run_simulation(aSea, seaView, chronons, save, commit, framerate, firstChrono
     # terminate display
     seaView.Quit()
 
-wator()
+if __name__ == "__main__":
+    wator()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 15:28:41 2026
+
+Benchmark Wa-Tor on fixed seed scenarios, and write the results as JSON
+so that runs of different commits can be compared.
+Each scenario runs in a process of its own, for a clean peak memory,
+and reports chronons per second, the time of every phase of a chronon
+(turn, cleanCreatures, render, save), and the time to write a full
+checkpoint and to restore the last commit. Microbenchmarks time
+getAdjacent, hunt, flee and cleanCreatures of the object sea. Startup
+times the cold start of a new interpreter that imports the simulation,
+as a sweep worker does, and notes whether it loaded pygame.
+
+    python watorbench.py --output before.json
+    python watorbench.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # render off screen
+
+import numpy
+
+from wator import generateSea, restoreSea, saveSea, xPixels, yPixels
+from sea import Shark, Fish
+from seadisplay import SeaDisplay, NullDisplay
+from searandom import BatchedRandom
+from seasnapshot import SnapshotStore, writeSnapshot
+
+BENCH_VERSION = 1
+
+# name: x, y, cell size, shark and fish densities, traditional
+SCENARIOS = {
+    "small": (40, 20, 5, 0.1, 0.25, False),
+    "default": (160, 90, 5, 0.1, 0.25, False),
+    "maximum": (xPixels // 2 - (xPixels // 2) % 2, yPixels // 2 - (yPixels // 2) % 2, 2, 0.1, 0.25, False),
+    "traditional": (160, 90, 5, 0.1, 0.25, True),
+    "fish-heavy": (160, 90, 5, 0.02, 0.5, False),
+    "shark-heavy": (160, 90, 5, 0.3, 0.3, False),
+}
+
+class PhaseTimer(object):
+    """
+    Total time and calls of a phase.
+    """
+    def __init__(self):
+        self.total = 0.0
+        self.calls = 0
+
+    def wrap(self, function):
+        def timed(*args, **kwargs):
+            before = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.total += time.perf_counter() - before
+                self.calls += 1
+        return timed
+
+    def export(self):
+        return {"total": self.total, "calls": self.calls, "mean": self.total / self.calls if self.calls else 0.0}
+
+def makeRandom(engine, seed):
+    if engine == "object":
+        return BatchedRandom(seed)
+    return numpy.random.default_rng(seed)
+
+def makeSea(name, engine, seed, workers=0):
+    x, y, cellsize, sharkDensity, fishDensity, traditional = SCENARIOS[name]
+    aSea = generateSea(x, y, int(x * y * sharkDensity), int(x * y * fishDensity), traditional,
+                       7, 3, 2, makeRandom(engine, seed), engine, workers)
+    return aSea, cellsize
+
+def runScenario(name, engine, chronons, commit, seed, workers):
+    """
+    Run one scenario, return its results as a dictionary.
+    """
+    aSea, cellsize = makeSea(name, engine, seed, workers)
+    seaView = SeaDisplay(aSea, cellsize)
+    phases = {phase: PhaseTimer() for phase in ("turn", "cleanCreatures", "render", "save")}
+    if engine == "object":
+        # timed inside turn, so it is part of the turn time as well
+        aSea.cleanCreatures = phases["cleanCreatures"].wrap(aSea.cleanCreatures)
+    turn = phases["turn"].wrap(aSea.turn)
+    render = phases["render"].wrap(seaView.showImage)
+    save = phases["save"].wrap(saveSea)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SnapshotStore(directory, 10)
+        tick = 0
+        start = time.perf_counter()
+        while tick < chronons and aSea.getSharks() != 0 and aSea.getFishes() != 0:
+            turn()
+            render(aSea)
+            tick += 1
+            if tick % commit == 0:
+                save(aSea, seaView, tick, store)
+        elapsed = time.perf_counter() - start
+
+        header = aSea.exportSettings()
+        header["fileNumber"], header["cellsize"] = seaView.exportDisplay()
+        header["chronon"] = tick
+        before = time.perf_counter()
+        writeSnapshot(os.path.join(directory, "full.npz"), header, aSea.exportColumns())
+        checkpoint = {"save": time.perf_counter() - before, "bytes": os.path.getsize(os.path.join(directory, "full.npz"))}
+        if store.getChronons():
+            before = time.perf_counter()
+            restored = restoreSea(makeRandom("object", seed), NullDisplay, store=SnapshotStore(directory, 10))[0]
+            checkpoint["restore"] = time.perf_counter() - before
+            restored.close()
+    aSea.close()
+    seaView.Quit()
+
+    return {"scenario": name, "engine": engine, "size": [aSea.getMaxX(), aSea.getMaxY()],
+            "chronons": tick, "seconds": elapsed, "chrononsPerSecond": tick / elapsed if elapsed else 0.0,
+            "phases": {phase: timer.export() for phase, timer in phases.items() if timer.calls},
+            "checkpoint": checkpoint,
+            "peakMemoryMB": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+            "final": str(aSea)}
+
+def perCall(timer):
+    return timer.total / timer.calls * 1e6 if timer.calls else 0.0
+
+def runMicro(seed, rounds):
+    """
+    Time the creature methods of the default object sea, in microseconds per call.
+    """
+    timers = {name: PhaseTimer() for name in ("getAdjacent", "hunt", "flee", "cleanCreatures")}
+    for round in range(rounds):
+        aSea, cellsize = makeSea("default", "object", seed + round)
+        aSea.turn()
+
+        getAdjacent = timers["getAdjacent"].wrap(lambda c: c.pos.getAdjacent(c.traditional))
+        for creature in aSea.creatures:
+            getAdjacent(creature)
+
+        # each creature moves with its neighbours as they are just before it
+        for creature in list(aSea.creatures):
+            if not creature.alive:
+                continue
+            empty, occupied = creature.pos.getAdjacent(creature.traditional)
+            if len(empty) == 0:
+                continue
+            if type(creature) is Shark:
+                timers["hunt"].wrap(creature.hunt)(empty)
+            elif type(creature) is Fish:
+                timers["flee"].wrap(creature.flee)(empty)
+
+        # a tenth of the creatures die
+        for creature in aSea.creatures[::10]:
+            creature.died()
+        timers["cleanCreatures"].wrap(aSea.cleanCreatures)()
+    return {name: {"calls": timer.calls, "microseconds": perCall(timer)} for name, timer in timers.items()}
+
+# name: statement run by a new interpreter
+STARTUP = {
+    "python": "pass",
+    "sea": "import sea",
+    "wator": "import wator",
+    "watorsweep": "import watorsweep",
+    "headless run": "import sys; sys.argv = ['wator.py', '--headless', '-c', '1', '-x', '20', '-y', '10']; import wator; wator.wator()",
+}
+
+def runStartup(rounds):
+    """
+    Return the median seconds of each STARTUP statement in a new
+    interpreter, and whether it imported pygame.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, statement in STARTUP.items():
+        seconds = []
+        for round in range(rounds):
+            before = time.perf_counter()
+            loaded = subprocess.run([sys.executable, "-c", statement + "; import sys; print('pygame' in sys.modules)"],
+                                    cwd=directory, capture_output=True, text=True).stdout.split()
+            seconds.append(time.perf_counter() - before)
+        results[name] = {"seconds": statistics.median(seconds), "pygame": loaded[-1:] == ["True"]}
+    return results
+
+def inProcess(results, function, *args):
+    results.put(function(*args))
+
+def isolated(function, *args):
+    """
+    Return function(*args), called in a new process.
+    """
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=inProcess, args=(results, function) + args)
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+def gitCommit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(report, baselinePath):
+    """
+    Print the chronons per second of report against the baseline report.
+    """
+    with open(baselinePath) as baselineFH:
+        baseline = json.load(baselineFH)
+    before = {(r["scenario"], r["engine"]): r for r in baseline["scenarios"]}
+    print("COMPARE -:- %s against %s" % (report["commit"], baseline.get("commit")))
+    for result in report["scenarios"]:
+        old = before.get((result["scenario"], result["engine"]))
+        if old is None or not old["chrononsPerSecond"]:
+            continue
+        print("%-12s %-8s %10.2f -> %10.2f chronons/s  x%.2f" % (result["scenario"], result["engine"], old["chrononsPerSecond"],
+              result["chrononsPerSecond"], result["chrononsPerSecond"] / old["chrononsPerSecond"]))
+    for name, startup in report.get("startup", {}).items():
+        old = baseline.get("startup", {}).get(name)
+        if old and startup["seconds"]:
+            print("%-21s %10.3f -> %10.3f s startup  x%.2f" % (name, old["seconds"], startup["seconds"],
+                  old["seconds"] / startup["seconds"]))
+    for name, micro in report.get("micro", {}).items():
+        old = baseline.get("micro", {}).get(name)
+        if old and micro["microseconds"]:
+            print("%-21s %10.2f -> %10.2f us/call  x%.2f" % (name, old["microseconds"], micro["microseconds"],
+                  old["microseconds"] / micro["microseconds"]))
+
+def bench(args):
+    report = {"version": BENCH_VERSION, "commit": gitCommit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "python": platform.python_version(), "numpy": numpy.__version__, "machine": platform.machine(),
+              "cpus": os.cpu_count(), "chronons": args.chronons, "seed": args.seed, "scenarios": []}
+    for name in args.scenario:
+        for engine in args.engine:
+            result = isolated(runScenario, name, engine, args.chronons, args.commit, args.seed, args.workers)
+            report["scenarios"].append(result)
+            print("%-12s %-8s %4dx%-4d Chronons: %4d %10.2f chronons/s Peak: %7.1f MB" % (name, engine, result["size"][0], result["size"][1],
+                  result["chronons"], result["chrononsPerSecond"], result["peakMemoryMB"]))
+    if args.micro > 0:
+        report["micro"] = isolated(runMicro, args.seed, args.micro)
+        for name, micro in report["micro"].items():
+            print("%-21s %10.2f us/call (%d calls)" % (name, micro["microseconds"], micro["calls"]))
+    if args.startup > 0:
+        report["startup"] = runStartup(args.startup)
+        for name, startup in report["startup"].items():
+            print("%-21s %10.3f s startup%s" % (name, startup["seconds"], " with pygame" if startup["pygame"] else ""))
+
+    with open(args.output, "w") as outputFH:
+        json.dump(report, outputFH, indent=1)
+    if args.compare:
+        compare(report, args.compare)
+
+def command_line():
+    parser = argparse.ArgumentParser(description="Benchmark Wa-Tor on fixed seed scenarios.")
+    parser.add_argument("-c", "--chronons", type=int,
+                        help="chronons per scenario, default 50",
+                        default=50)
+    parser.add_argument("-C", "--commit", type=int,
+                        help="chronons between checkpoint commits, default 10",
+                        default=10)
+    parser.add_argument("--compare",
+                        help="earlier results file to compare against")
+    parser.add_argument("--engine", nargs="+", choices=["object", "numpy", "parallel"],
+                        help="simulation engines, default object numpy",
+                        default=["object", "numpy"])
+    parser.add_argument("--micro", type=int,
+                        help="rounds of microbenchmarks, 0 for none, default 3",
+                        default=3)
+    parser.add_argument("-o", "--output",
+                        help="results file, default bench.json",
+                        default="bench.json")
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS),
+                        help="scenarios to run, default all",
+                        default=list(SCENARIOS))
+    parser.add_argument("--seed", type=int,
+                        help="seed of every scenario, default 1",
+                        default=1)
+    parser.add_argument("--startup", type=int,
+                        help="rounds of startup timings, 0 for none, default 5",
+                        default=5)
+    parser.add_argument("-w", "--workers", type=int,
+                        help="worker processes of --engine parallel, default 0",
+                        default=0)
+    args = parser.parse_args()
+    if args.chronons < 1:
+        print("chronons must be greater than zero")
+        quit(1)
+    if args.commit < 1:
+        print("commit must be greater than zero")
+        quit(1)
+    return args
+
+if __name__ == "__main__":
+    bench(command_line())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:14:51 2026
+
+Sweep Wa-Tor over a grid of parameters.
+Every combination of sea size, initial densities, spawn and starve ages,
+search pattern, engine and seed is a case. Cases run headless on a pool
+of processes, one per core by default. The shark, fish and empty counts
+of every chronon of every case go to one results file,
+
+    case,chronon,sharks,fishes,empty
+
+and the parameters of every finished case to <results>.cases. A sweep
+that is interrupted is resumed by running it again with the same grid,
+finished cases are skipped. Cases of --engine ensemble that differ only
+in their seed run together as the replicas of one SeaEnsemble, a replica
+is the sea of --engine parallel with its seed. With --stop-on-steady-state a case ends
+once its sea repeats or its counts are stationary, and its status says
+which.
+"""
+
+import argparse
+import contextlib
+import csv
+import functools
+import io
+import itertools
+import multiprocessing
+import os
+
+import numpy
+
+from wator import generateSea, run_simulation
+from seadisplay import NullDisplay
+from searandom import BatchedRandom
+from seaensemble import SeaEnsemble
+from seasteady import SteadyState
+
+CASE_FIELDS = ["case", "x", "y", "sharks", "fishes", "sharkspawn", "sharkstarve", "fishspawn", "traditional", "engine", "seed", "chronons", "status"]
+RESULT_FIELDS = ["case", "chronon", "sharks", "fishes", "empty"]
+
+def expandGrid(args):
+    """
+    Return the list of cases, dictionaries of parameters, in a fixed order.
+    """
+    cases = []
+    grid = itertools.product(args.size, args.shark_density, args.fish_density, args.sharkspawn,
+                             args.sharkstarve, args.fishspawn, args.traditional, args.engine, args.seeds)
+    for number, (size, sharkDensity, fishDensity, sharkspawn, sharkstarve, fishspawn, traditional, engine, seed) in enumerate(grid):
+        x, y = [int(d) for d in size.lower().split("x")]
+        cases.append({"case": number, "x": x, "y": y,
+                      "sharks": int(x * y * sharkDensity), "fishes": int(x * y * fishDensity),
+                      "sharkspawn": sharkspawn, "sharkstarve": sharkstarve, "fishspawn": fishspawn,
+                      "traditional": traditional, "engine": engine, "seed": seed, "chronons": args.chronons})
+    return cases
+
+def runCase(case, steady=False):
+    """
+    Run one case headless, return (case, status, rows of counts).
+    steady = end the case on a steady state.
+    """
+    rows = []
+    steadyState = SteadyState() if steady else None
+    def observe(chronon, aSea, elapsedTurn, elapsedDisp):
+        sharks, fishes = aSea.getSharks(), aSea.getFishes()
+        rows.append((case["case"], chronon, sharks, fishes, case["x"] * case["y"] - sharks - fishes))
+        return steadyState is not None and steadyState.observe(chronon, aSea, elapsedTurn, elapsedDisp)
+
+    if case["engine"] == "numpy":
+        rng = numpy.random.default_rng(case["seed"])
+    else:
+        rng = BatchedRandom(case["seed"])
+    status = "done"
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            aSea = generateSea(case["x"], case["y"], case["sharks"], case["fishes"], case["traditional"],
+                               case["sharkspawn"], case["sharkstarve"], case["fishspawn"], rng, case["engine"])
+            observe(0, aSea, 0.0, 0.0)
+            run_simulation(aSea, NullDisplay(aSea, 1), case["chronons"], False, 1, 0.0, observe=observe)
+    except SystemExit:
+        status = "invalid"
+    except Exception as A:
+        status = "failed: %r" % A
+    if steadyState is not None and steadyState.kind is not None and status == "done":
+        status = "steady: " + steadyState.kind
+    return case, status, rows
+
+def runEnsemble(cases, steady=False):
+    """
+    Run cases that differ only in their seed as the replicas of one
+    SeaEnsemble, return a list of (case, status, rows of counts).
+    """
+    first = cases[0]
+    if first["sharks"] + first["fishes"] > first["x"] * first["y"] or min(first["sharkspawn"], first["sharkstarve"], first["fishspawn"]) < 1:
+        return [(case, "invalid", []) for case in cases]
+    steadyStates = [SteadyState() for case in cases] if steady else None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ensemble = SeaEnsemble([case["seed"] for case in cases], first["x"], first["y"], first["traditional"],
+                                   first["sharkspawn"], first["sharkstarve"], first["fishspawn"])
+            ensemble.populate(first["sharks"], first["fishes"])
+            while ensemble.chronon < first["chronons"] and ensemble.active.any():
+                ensemble.turn()
+                if steadyStates is not None:
+                    for replica in numpy.flatnonzero(ensemble.active).tolist():
+                        if steadyStates[replica].observe(ensemble.chronon, ensemble.getReplica(replica), 0.0, 0.0):
+                            ensemble.finish([replica])
+    except Exception as A:
+        return [(case, "failed: %r" % A, []) for case in cases]
+    results = []
+    for replica, (case, series) in enumerate(zip(cases, ensemble.getSeries())):
+        status = "done"
+        if steadyStates is not None and steadyStates[replica].kind is not None:
+            status = "steady: " + steadyStates[replica].kind
+        rows = [(case["case"], chronon, sharks, fishes, empty) for chronon, sharks, fishes, empty in series.tolist()]
+        results.append((case, status, rows))
+    return results
+
+def runCases(cases, steady=False):
+    """
+    Run a list of cases, one case or the replicas of an ensemble.
+    """
+    if cases[0]["engine"] == "ensemble":
+        return runEnsemble(cases, steady)
+    return [runCase(cases[0], steady)]
+
+def groupCases(cases):
+    """
+    Return the cases in lists to run together, the --engine ensemble cases
+    that differ only in their seed share a list.
+    """
+    groups = {}
+    for case in cases:
+        if case["engine"] == "ensemble":
+            key = tuple(value for field, value in case.items() if field not in ("case", "seed"))
+        else:
+            key = case["case"]
+        groups.setdefault(key, []).append(case)
+    return list(groups.values())
+
+def readFinished(casesPath, cases):
+    """
+    Return the numbers of the cases already finished, checking that they
+    were run with the same parameters.
+    """
+    finished = set()
+    if not os.path.exists(casesPath):
+        return finished
+    with open(casesPath, newline="") as casesFH:
+        for row in csv.DictReader(casesFH):
+            number = int(row["case"])
+            expected = {field: str(value) for field, value in cases[number].items()} if number < len(cases) else None
+            recorded = {field: row[field] for field in CASE_FIELDS if field != "status"}
+            if expected != recorded:
+                print("Case %d in %s does not match the grid, use another --results file" % (number, casesPath))
+                exit(2)
+            finished.add(number)
+    return finished
+
+def dropUnfinished(resultsPath, finished):
+    """
+    Remove the rows of cases that did not finish, written before an interruption.
+    """
+    if not os.path.exists(resultsPath):
+        return
+    temporary = resultsPath + ".tmp"
+    with open(resultsPath, newline="") as resultsFH, open(temporary, "w", newline="") as keptFH:
+        reader = csv.reader(resultsFH)
+        writer = csv.writer(keptFH)
+        writer.writerow(next(reader, RESULT_FIELDS))
+        for row in reader:
+            if int(row[0]) in finished:
+                writer.writerow(row)
+    os.replace(temporary, resultsPath)
+
+def sweep(args):
+    cases = expandGrid(args)
+    casesPath = args.results + ".cases"
+    finished = readFinished(casesPath, cases)
+    dropUnfinished(args.results, finished)
+    todo = [case for case in cases if case["case"] not in finished]
+    print("SWEEP -:- Cases: %d Finished: %d To run: %d Processes: %d" % (len(cases), len(finished), len(todo), args.processes))
+
+    newResults = not os.path.exists(args.results)
+    newCases = not os.path.exists(casesPath)
+    with open(args.results, "a", newline="") as resultsFH, open(casesPath, "a", newline="") as casesFH:
+        results = csv.writer(resultsFH)
+        casesOut = csv.DictWriter(casesFH, CASE_FIELDS)
+        if newResults:
+            results.writerow(RESULT_FIELDS)
+        if newCases:
+            casesOut.writeheader()
+        with multiprocessing.Pool(args.processes) as pool:
+            for finishedCases in pool.imap_unordered(functools.partial(runCases, steady=args.stop_on_steady_state), groupCases(todo)):
+                for case, status, rows in finishedCases:
+                    # counts first, so a case is only marked finished once its rows are on disk
+                    results.writerows(rows)
+                    resultsFH.flush()
+                    os.fsync(resultsFH.fileno())
+                    casesOut.writerow(dict(case, status=status))
+                    casesFH.flush()
+                    os.fsync(casesFH.fileno())
+                    print("Case: %06d Chronons: %d %s" % (case["case"], len(rows) - 1, status))
+
+def command_line():
+    parser = argparse.ArgumentParser(description="Run Wa-Tor headless over a grid of parameters.")
+    parser.add_argument("-c", "--chronons", type=int,
+                        help="maximum number of chronons per case, default 1000",
+                        default=1000)
+    parser.add_argument("--engine", nargs="+", choices=["object", "numpy", "ensemble"],
+                        help="simulation engines, ensemble runs the seeds of a case together, default numpy",
+                        default=["numpy"])
+    parser.add_argument("--fish-density", nargs="+", type=float,
+                        help="initial fishes as fractions of the sea, default 0.25",
+                        default=[0.25])
+    parser.add_argument("--fishspawn", nargs="+", type=int,
+                        help="fish spawn ages, default 2",
+                        default=[2])
+    parser.add_argument("-p", "--processes", type=int,
+                        help="number of worker processes, default one per core",
+                        default=os.cpu_count())
+    parser.add_argument("--results",
+                        help="results file, default sweep.csv",
+                        default="sweep.csv")
+    parser.add_argument("--seeds", nargs="+", type=int,
+                        help="seeds, each case is run once per seed, default 1",
+                        default=[1])
+    parser.add_argument("--shark-density", nargs="+", type=float,
+                        help="initial sharks as fractions of the sea, default 0.1",
+                        default=[0.1])
+    parser.add_argument("--sharkspawn", nargs="+", type=int,
+                        help="shark spawn ages, default 7",
+                        default=[7])
+    parser.add_argument("--sharkstarve", nargs="+", type=int,
+                        help="shark starve times, default 3",
+                        default=[3])
+    parser.add_argument("--size", nargs="+",
+                        help="sea sizes as XxY, default 160x90",
+                        default=["160x90"])
+    parser.add_argument("--stop-on-steady-state", action="store_true",
+                        help="end a case when its sea repeats exactly, or its shark and fish counts are stationary",
+                        default=False)
+    parser.add_argument("-t", "--traditional", nargs="+", type=int, choices=[0, 1],
+                        help="search patterns, 1 traditional, 0 with diagonals, default 0",
+                        default=[0])
+    args = parser.parse_args()
+    args.traditional = [bool(t) for t in args.traditional]
+    if args.processes < 1:
+        print("processes must be greater than zero")
+        quit(1)
+    if args.chronons < 1:
+        print("chronons must be greater than zero")
+        quit(1)
+    return args
+
+if __name__ == "__main__":
+    sweep(command_line())